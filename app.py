@@ -5,9 +5,17 @@ from dotenv import load_dotenv
 from datetime import datetime
 
 from database.models import db, initialize_database
-from handlers.chat_handler import chat_handler
-from handlers.space_handler import space_handler
+from database.sqlite_config import database_config, init_sqlite, sqlite_stats
 from handlers.base_handler import BaseHandler
+from services.data_snapshot import get_data_snapshot, refresh_data_snapshot
+from services.render_cache import render_cache
+from routes.http_cache import payload_cache
+from services.llm_metrics import llm_usage
+from services.answer_cache import answer_cache
+from services.single_flight import llm_single_flight
+from services.llm_admission import llm_gate
+from services.llm_resilience import llm_breaker
+from services.chat_writer import chat_writer
 
 from routes.chat_routes import chat_bp
 from routes.user_routes import user_bp
@@ -23,11 +31,10 @@ os.makedirs(instance_path, exist_ok=True)
 
 app = Flask(__name__)
 
-app.config.update({
-    'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.join(instance_path, "chatbot.db")}',
-    'SQLALCHEMY_TRACK_MODIFICATIONS': False
-})
+app.config.update(database_config(os.path.join(instance_path, "chatbot.db")))
 db.init_app(app)
+init_sqlite(app, db)
+chat_writer.init_app(app)
 
 _default_origins = (
     'http://localhost:5173,http://localhost:3000,'
@@ -40,6 +47,7 @@ _CORS_HEADERS = {
     'Access-Control-Allow-Headers': 'Content-Type,Authorization',
     'Access-Control-Allow-Methods': 'GET,PUT,POST,DELETE,OPTIONS',
     'Access-Control-Allow-Credentials': 'true',
+    'Access-Control-Expose-Headers': 'ETag',
 }
 
 
@@ -85,9 +93,10 @@ app.register_blueprint(report_bp)
 @app.route('/api/health', methods=['GET'])
 def health_check():
     try:
-        override_count = len(space_handler.load_overrides_data())
-        merged_count = len(space_handler.get_merged_spaces_data())
-        chat_spaces_count = len(chat_handler.spaces_data) if hasattr(chat_handler, 'spaces_data') and chat_handler.spaces_data else 0
+        snapshot = get_data_snapshot()
+        override_count = len(snapshot.override_centers)
+        merged_count = len(snapshot.centers)
+        chat_spaces_count = len(snapshot.rental_spaces)
 
         return jsonify({
             'status': 'healthy',
@@ -104,8 +113,19 @@ def health_check():
             'data_status': {
                 'override_spaces': f'{override_count} spaces',
                 'merged_spaces': f'{merged_count} spaces',
-                'chat_handler_spaces': f'{chat_spaces_count} spaces'
-            }
+                'chat_handler_spaces': f'{chat_spaces_count} spaces',
+                'snapshot_version': snapshot.version,
+                'snapshot_digest': snapshot.digest
+            },
+            'render_cache': render_cache.stats(),
+            'payload_cache': payload_cache.stats(),
+            'llm_usage': llm_usage.stats(),
+            'llm_answer_cache': answer_cache.stats(),
+            'llm_single_flight': llm_single_flight.stats(),
+            'llm_admission': llm_gate.stats(),
+            'llm_circuit': llm_breaker.stats(),
+            'chat_writer': chat_writer.stats(),
+            'sqlite': sqlite_stats(db)
         })
     except Exception as e:
         return jsonify({'status': 'unhealthy', 'service': 'busan-chatbot-backend', 'error': str(e)}), 500
@@ -115,16 +135,17 @@ def health_check():
 def get_spaces_debug_status():
     try:
         _base = BaseHandler()
-        merged_spaces = space_handler.get_merged_spaces_data()
-        chat_spaces_count = len(chat_handler.spaces_data) if hasattr(chat_handler, 'spaces_data') and chat_handler.spaces_data else 0
+        snapshot = get_data_snapshot()
+        merged_spaces = snapshot.centers
 
         return jsonify({
             'success': True,
             'data_status': {
-                'override_spaces': len(space_handler.load_overrides_data()),
+                'override_spaces': len(snapshot.override_centers),
                 'merged_spaces': len(merged_spaces),
-                'chat_handler_spaces': chat_spaces_count
+                'chat_handler_spaces': len(snapshot.rental_spaces)
             },
+            'snapshot': snapshot.stats(),
             'current_dir': os.getcwd(),
             'app_dir': basedir,
             'instance_path': instance_path,
@@ -139,15 +160,16 @@ def get_spaces_debug_status():
 @app.route('/api/debug/reload-spaces', methods=['POST'])
 def reload_spaces_data():
     try:
-        old_merged = len(space_handler.get_merged_spaces_data())
-        if hasattr(chat_handler, 'load_spaces_data'):
-            chat_handler.spaces_data = chat_handler.load_spaces_data()
-        new_merged = len(space_handler.get_merged_spaces_data())
+        old_snapshot = get_data_snapshot()
+        new_snapshot = refresh_data_snapshot()
+        old_merged = len(old_snapshot.centers)
+        new_merged = len(new_snapshot.centers)
 
         return jsonify({
             'success': True,
             'message': '데이터 재로드 완료',
             'merged_count': new_merged,
+            'snapshot_version': new_snapshot.version,
             'changes': {'merged': f'{old_merged} → {new_merged}'}
         })
     except Exception as e:
@@ -172,6 +194,7 @@ def admin_refresh_crawl():
     try:
         spaces = crawl_new_data()
         programs = refresh_programs_cache()
+        snapshot = refresh_data_snapshot()
         elapsed = round(time.time() - start, 2)
 
         return jsonify({
@@ -180,6 +203,7 @@ def admin_refresh_crawl():
             'elapsed_seconds': elapsed,
             'spaces_count': len(spaces),
             'programs_count': len(programs),
+            'snapshot_version': snapshot.version,
             'refreshed_at': datetime.utcnow().isoformat()
         })
     except Exception as e:
@@ -210,6 +234,7 @@ def warm_up_youth_data():
         from services.youth_program_crawler import ensure_programs_cache_fresh
         ensure_spaces_cache_fresh()
         ensure_programs_cache_fresh()
+        refresh_data_snapshot()
     except Exception as e:
         print(f"⚠️ 부팅 시 데이터 준비 실패, 기존 캐시 파일로 계속 진행합니다: {e}")
 
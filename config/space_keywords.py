@@ -0,0 +1,35 @@
+# 대여공간 키워드/이용 목적 매핑 (ChatHandler, 데이터 스냅샷 인덱스에서 공통 사용)
+
+KEYWORD_MAPPING = {
+    "📝스터디/회의": ["📝스터디/회의", "📝 스터디/회의", "스터디/회의", "스터디", "회의"],
+    "🎤교육/강연": ["🎤교육/강연", "🏫교육/강연", "🏫 교육/강연", "교육/강연", "교육", "강연"],
+    "👥커뮤니티": ["👥커뮤니티", "👥모임/커뮤니티", "👥 모임/커뮤니티", "모임/커뮤니티", "커뮤니티", "모임"],
+    "🚀진로/창업": ["🚀진로/창업", "🚀 진로/창업", "진로/창업", "진로", "창업"],
+    "🎨문화/창작": ["🎨문화/창작", "🎨 문화/창작", "문화/창작", "문화", "창작"],
+    "🛠작업/창작실": ["🛠작업/창작실", "💻작업/창작실", "💻 작업/창작실", "작업/창작실", "작업", "창작실"],
+    "🧘휴식/놀이": ["🧘휴식/놀이", "🌿휴식/놀이", "🌿 휴식/놀이", "휴식/놀이", "휴식", "놀이"],
+    "🎪행사/이벤트": ["🎪행사/이벤트", "🎬행사/이벤트", "🎬 행사/이벤트", "행사/이벤트", "행사", "이벤트"]
+}
+
+PURPOSE_MAPPING = {
+    '스터디/회의': ['📝스터디/회의', '📝 스터디/회의', '스터디', '회의'],
+    '교육/강연': ['🎤교육/강연', '🏫교육/강연', '🏫 교육/강연', '교육', '강연'],
+    '커뮤니티': ['👥커뮤니티', '👥모임/커뮤니티', '👥 모임/커뮤니티', '커뮤니티', '모임'],
+    '진로/창업': ['🚀진로/창업', '🚀 진로/창업', '진로', '창업'],
+    '문화/창작': ['🎨문화/창작', '🎨 문화/창작', '문화', '창작'],
+    '작업/창작실': ['🛠작업/창작실', '💻작업/창작실', '💻 작업/창작실', '작업', '창작실'],
+    '휴식/놀이': ['🧘휴식/놀이', '🌿휴식/놀이', '🌿 휴식/놀이', '휴식', '놀이'],
+    '행사/이벤트': ['🎪행사/이벤트', '🎬행사/이벤트', '🎬 행사/이벤트', '행사', '이벤트']
+}
+
+# 검색 키워드(KEYWORD_MAPPING 키) → 표준 카테고리 ID(PURPOSE_MAPPING 키)
+KEYWORD_CATEGORY = {
+    "📝스터디/회의": '스터디/회의',
+    "🎤교육/강연": '교육/강연',
+    "👥커뮤니티": '커뮤니티',
+    "🚀진로/창업": '진로/창업',
+    "🎨문화/창작": '문화/창작',
+    "🛠작업/창작실": '작업/창작실',
+    "🧘휴식/놀이": '휴식/놀이',
+    "🎪행사/이벤트": '행사/이벤트'
+}
@@ -0,0 +1,94 @@
+# 가벼운 스키마 마이그레이션 - 버전은 SQLite 파일 헤더의 PRAGMA user_version에 기록한다.
+# create_all()은 없는 테이블만 만들고 기존 테이블은 고치지 않으므로, 이미 운영 중인 chatbot.db(Render 디스크)에는
+# 여기 등록한 단계를 user_version 다음 번호부터 순서대로 적용한다.
+# - 새 DB는 create_all()이 최신 스키마로 만들고 바로 최신 버전으로 기록한다. 각 단계는 멱등하게 작성한다.
+# - gunicorn 워커가 동시에 떠도 BEGIN IMMEDIATE 잠금 안에서 create_all()과 마이그레이션을 한 번에 하나씩 실행한다.
+# 새 단계는 MIGRATIONS 끝에 (다음 번호, 설명, 함수)로 추가한다. 이미 배포된 단계는 고치지 않는다.
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.exec_driver_sql(f'PRAGMA table_info({table})')}
+
+
+def _add_column(conn, table, name, column_type):
+    if name not in _columns(conn, table):
+        conn.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+
+
+def _add_chat_context_columns(conn):
+    _add_column(conn, 'chat', 'summary', 'TEXT')
+    _add_column(conn, 'chat', 'summary_until', 'INTEGER')
+    _add_column(conn, 'message', 'route', 'VARCHAR(50)')
+
+
+def _add_access_path_indexes(conn):
+    conn.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_message_chat_id_created_at ON message (chat_id, created_at)')
+    conn.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_chat_user_id_created_at ON chat (user_id, created_at)')
+    conn.exec_driver_sql('CREATE INDEX IF NOT EXISTS ix_error_report_created_at ON error_report (created_at)')
+    conn.exec_driver_sql('ANALYZE')
+
+
+def _message_id_autoincrement(conn):
+    """message.id를 AUTOINCREMENT로 (SQLite는 ALTER로 바꿀 수 없어 테이블을 새로 만들어 옮긴다)"""
+    table_sql = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'message'"
+    ).scalar()
+    if 'AUTOINCREMENT' in table_sql.upper():
+        return
+
+    conn.exec_driver_sql('''
+        CREATE TABLE message_new (
+            id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+            chat_id VARCHAR(120) NOT NULL REFERENCES chat (id),
+            sender VARCHAR(50) NOT NULL,
+            text TEXT NOT NULL,
+            route VARCHAR(50),
+            created_at DATETIME
+        )
+    ''')
+    conn.exec_driver_sql(
+        'INSERT INTO message_new (id, chat_id, sender, text, route, created_at) '
+        'SELECT id, chat_id, sender, text, route, created_at FROM message'
+    )
+    conn.exec_driver_sql('DROP TABLE message')
+    conn.exec_driver_sql('ALTER TABLE message_new RENAME TO message')
+    conn.exec_driver_sql('CREATE INDEX ix_message_chat_id_created_at ON message (chat_id, created_at)')
+
+
+MIGRATIONS = [
+    (1, 'chat.summary / chat.summary_until / message.route 컬럼 추가', _add_chat_context_columns),
+    (2, 'message(chat_id, created_at) / chat(user_id, created_at) / error_report(created_at) 인덱스', _add_access_path_indexes),
+    (3, 'message.id AUTOINCREMENT (증분 동기화 cursor용, 삭제된 id 재사용 방지)', _message_id_autoincrement),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.exec_driver_sql('PRAGMA user_version').scalar()
+
+
+def run_migrations(engine, metadata):
+    """없는 테이블을 만들고 아직 적용되지 않은 마이그레이션을 순서대로 적용한 뒤 적용한 개수를 반환"""
+    with engine.connect() as conn:
+        conn.exec_driver_sql('BEGIN IMMEDIATE')
+        try:
+            is_new = not conn.exec_driver_sql("SELECT count(*) FROM sqlite_master WHERE type = 'table'").scalar()
+            metadata.create_all(conn)
+            if is_new:
+                conn.exec_driver_sql(f'PRAGMA user_version = {LATEST_VERSION}')
+
+            current = schema_version(conn)
+            applied = 0
+            for version, description, migrate in MIGRATIONS:
+                if version <= current:
+                    continue
+                migrate(conn)
+                conn.exec_driver_sql(f'PRAGMA user_version = {version}')
+                applied += 1
+                print(f"🔧 DB 마이그레이션 {version}: {description}")
+            conn.exec_driver_sql('COMMIT')
+        except Exception:
+            conn.exec_driver_sql('ROLLBACK')
+            raise
+        return applied
@@ -1,6 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 
+from database.migrations import run_migrations
+
 db = SQLAlchemy()
 
 
@@ -15,16 +17,44 @@ class Chat(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     title = db.Column(db.String(200), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # LLM 맥락 창 밖으로 밀려난 오래된 대화의 누적 요약, 요약에 반영된 마지막 Message.id
+    summary = db.Column(db.Text, nullable=True)
+    summary_until = db.Column(db.Integer, nullable=True)
     messages = db.relationship('Message', backref='chat', lazy=True, cascade="all, delete-orphan")
 
+    # 사용자별 채팅 목록 (최신순)
+    __table_args__ = (db.Index('ix_chat_user_id_created_at', 'user_id', 'created_at'),)
+
 
 class Message(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     chat_id = db.Column(db.String(120), db.ForeignKey('chat.id'), nullable=False)
     sender = db.Column(db.String(50), nullable=False)
     text = db.Column(db.Text, nullable=False)
+    # 봇 메시지를 만든 라우트 이름 ('llm' 또는 결정적 라우트, 이전 데이터는 NULL)
+    route = db.Column(db.String(50), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # 채팅별 메시지 (시간순). id는 AUTOINCREMENT - 삭제된 id를 다시 쓰지 않아야 증분 동기화 cursor가 맞다
+    __table_args__ = (
+        db.Index('ix_message_chat_id_created_at', 'chat_id', 'created_at'),
+        {'sqlite_autoincrement': True},
+    )
+
+
+class DeletedChat(db.Model):
+    """삭제된 채팅 기록 (히스토리 증분 동기화에서 삭제를 알려주기 위해)"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    chat_id = db.Column(db.String(120), nullable=False)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # 사용자별 삭제 기록 (cursor 이후)
+    __table_args__ = (
+        db.Index('ix_deleted_chat_user_id_id', 'user_id', 'id'),
+        {'sqlite_autoincrement': True},
+    )
+
 
 class ErrorReport(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -34,9 +64,13 @@ class ErrorReport(db.Model):
     anonymous_id = db.Column(db.String(120), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # 관리자 제보 목록 (최신순)
+    __table_args__ = (db.Index('ix_error_report_created_at', 'created_at'),)
+
 
 def initialize_database(app):
     """데이터베이스 초기화"""
     with app.app_context():
-        db.create_all()
+        # 없는 테이블 생성(create_all) + 기존 DB 파일에는 create_all()이 적용하지 못하는 변경을 마이그레이션으로 적용
+        run_migrations(db.engine, db.metadata)
         print("데이터베이스가 초기화되었습니다.")
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""SQLite 동시 읽기/쓰기 벤치마크 - 기본 설정과 sqlite_config 설정 비교
+
+gunicorn 워커 여러 개가 같은 DB 파일을 쓰는 상황을 프로세스로 흉내 낸다.
+쓰기 프로세스는 채팅 턴 하나(사용자, 채팅, 메시지 2개)를 한 트랜잭션으로 저장하고,
+읽기 프로세스는 임의 사용자의 히스토리(채팅 + 메시지)를 조회한다.
+
+실행: python -m database.sqlite_benchmark --writers 4 --readers 4 --seconds 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+
+from database.models import db, User, Chat, Message
+from database.sqlite_config import engine_options, install_pragmas
+
+SEED_USERS = 200
+
+
+def make_engine(profile, db_path):
+    url = f'sqlite:///{db_path}'
+    if profile == 'baseline':
+        # 이전 app.py와 같은 설정 (엔진 옵션/PRAGMA 없음)
+        return create_engine(url)
+    engine = create_engine(url, **engine_options())
+    install_pragmas(engine)
+    return engine
+
+
+def write_turn(conn, anonymous_id):
+    user_id = conn.execute(select(User.id).where(User.anonymous_id == anonymous_id)).scalar()
+    if user_id is None:
+        user_id = conn.execute(User.__table__.insert().values(anonymous_id=anonymous_id)).inserted_primary_key[0]
+    chat_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    conn.execute(Chat.__table__.insert().values(id=chat_id, user_id=user_id, title='벤치마크', created_at=now))
+    conn.execute(Message.__table__.insert(), [
+        {'chat_id': chat_id, 'sender': 'user', 'text': '부산 청년 공간 알려줘', 'created_at': now},
+        {'chat_id': chat_id, 'sender': 'bot', 'text': '답변 ' * 50, 'route': 'llm', 'created_at': now},
+    ])
+
+
+def read_history(conn, anonymous_id):
+    return conn.execute(
+        select(Chat.id, Message.sender, Message.text)
+        .join(User, Chat.user_id == User.id)
+        .join(Message, Message.chat_id == Chat.id)
+        .where(User.anonymous_id == anonymous_id)
+        .order_by(Chat.created_at.desc(), Message.id)
+    ).all()
+
+
+def _worker(role, profile, db_path, seconds, start_at, results):
+    engine = make_engine(profile, db_path)
+    ops = locked = 0
+    latencies = []
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        anonymous_id = f'bench-{random.randrange(SEED_USERS)}'
+        started = time.perf_counter()
+        try:
+            if role == 'writer':
+                with engine.begin() as conn:
+                    write_turn(conn, anonymous_id)
+            else:
+                with engine.connect() as conn:
+                    read_history(conn, anonymous_id)
+        except OperationalError:
+            # 'database is locked'
+            locked += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        ops += 1
+    engine.dispose()
+    results.put((role, ops, locked, latencies))
+
+
+def run_profile(profile, writers, readers, seconds):
+    work_dir = tempfile.mkdtemp(prefix=f'sqlite-bench-{profile}-')
+    db_path = os.path.join(work_dir, 'chatbot.db')
+    try:
+        engine = make_engine(profile, db_path)
+        db.metadata.create_all(engine, tables=[User.__table__, Chat.__table__, Message.__table__])
+        with engine.begin() as conn:
+            for i in range(SEED_USERS):
+                write_turn(conn, f'bench-{i}')
+        engine.dispose()
+
+        results = multiprocessing.Queue()
+        start_at = time.time() + 1
+        procs = [
+            multiprocessing.Process(target=_worker, args=(role, profile, db_path, seconds, start_at, results))
+            for role in ['writer'] * writers + ['reader'] * readers
+        ]
+        for p in procs:
+            p.start()
+        collected = [results.get() for _ in procs]
+        for p in procs:
+            p.join()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    summary = {}
+    for role in ('writer', 'reader'):
+        rows = [r for r in collected if r[0] == role]
+        latencies = sorted(l for r in rows for l in r[3])
+        ops = sum(r[1] for r in rows)
+        summary[role] = {
+            'ops_per_sec': round(ops / seconds, 1),
+            'locked_errors': sum(r[2] for r in rows),
+            'p50_ms': round(latencies[len(latencies) // 2] * 1000, 2) if latencies else None,
+            'p99_ms': round(latencies[int(len(latencies) * 0.99)] * 1000, 2) if latencies else None,
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 동시 읽기/쓰기 벤치마크')
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--profile', choices=['baseline', 'tuned', 'both'], default='both')
+    args = parser.parse_args()
+
+    profiles = ['baseline', 'tuned'] if args.profile == 'both' else [args.profile]
+    print(f"📊 SQLite 벤치마크: 쓰기 {args.writers} / 읽기 {args.readers} 프로세스, {args.seconds}초")
+    for profile in profiles:
+        summary = run_profile(profile, args.writers, args.readers, args.seconds)
+        for role, s in summary.items():
+            print(f"  {profile:8} {role:6} {s['ops_per_sec']:>9} ops/s  locked {s['locked_errors']:>5}  "
+                  f"p50 {s['p50_ms']}ms  p99 {s['p99_ms']}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+import os
+
+from sqlalchemy import event
+
+# SQLite 성능 설정 - 연결마다 PRAGMA를 적용하고 엔진 풀 크기를 정한다.
+# - journal_mode=WAL: 읽기가 쓰기를 막지 않고 쓰기도 읽기를 막지 않는다 (gunicorn 워커 여러 개가 같은 DB 파일 사용)
+# - synchronous=NORMAL: WAL에서는 커밋마다 fsync하지 않아도 DB가 깨지지 않는다 (전원 차단 시 마지막 커밋만 유실 가능)
+# - busy_timeout: 다른 연결이 쓰는 중이면 바로 'database is locked' 대신 기다렸다가 다시 시도
+# - cache_size / mmap_size / temp_store: 페이지 캐시, 메모리 맵 읽기, 임시 테이블을 메모리에
+# 모두 환경변수로 바꿀 수 있고, SQLITE_JOURNAL_MODE=DELETE 등으로 예전 동작으로 되돌릴 수 있다.
+
+JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL').upper()
+SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+# KiB 단위 (PRAGMA cache_size에는 음수로 넘긴다)
+CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', '16384'))
+MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', str(64 * 1024 * 1024)))
+TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY').upper()
+
+# 연결 풀 - gevent 워커는 그린렛마다 요청 하나를 처리하므로 기본값은 워커의 동시 요청 수(worker_connections)만큼
+# 연결을 허용한다 (POOL_SIZE개는 유지, 나머지는 필요할 때 열었다가 닫는 overflow). 모자라면 POOL_TIMEOUT초까지 기다린다.
+# LLM 요청은 프롬프트를 만든 뒤 LLM 응답을 기다리기 전에 연결을 돌려주므로(chat_handler._release_db_session)
+# 풀을 줄일 때도 요청이 DB를 쓰는 동안만 연결을 잡는다는 전제를 깨지 않아야 한다.
+WORKER_CONNECTIONS = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '100'))
+POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', '5'))
+POOL_MAX_OVERFLOW = int(os.environ.get('SQLITE_POOL_MAX_OVERFLOW', str(max(WORKER_CONNECTIONS - POOL_SIZE, 0))))
+POOL_TIMEOUT = float(os.environ.get('SQLITE_POOL_TIMEOUT', '30'))
+
+
+def sqlite_pragmas():
+    """연결마다 실행할 PRAGMA 목록"""
+    return [
+        f'PRAGMA journal_mode={JOURNAL_MODE}',
+        f'PRAGMA synchronous={SYNCHRONOUS}',
+        f'PRAGMA busy_timeout={BUSY_TIMEOUT_MS}',
+        f'PRAGMA cache_size={-CACHE_SIZE_KB}',
+        f'PRAGMA mmap_size={MMAP_SIZE}',
+        f'PRAGMA temp_store={TEMP_STORE}',
+    ]
+
+
+def engine_options():
+    """SQLALCHEMY_ENGINE_OPTIONS"""
+    return {
+        'pool_size': POOL_SIZE,
+        'max_overflow': POOL_MAX_OVERFLOW,
+        'pool_timeout': POOL_TIMEOUT,
+        'connect_args': {
+            # 드라이버 수준 잠금 대기 (busy_timeout과 같은 값, 초 단위)
+            'timeout': BUSY_TIMEOUT_MS / 1000,
+            # 풀의 연결은 여러 스레드/그린렛이 번갈아 쓴다
+            'check_same_thread': False,
+        },
+    }
+
+
+def database_config(db_path):
+    """Flask app.config에 넣을 SQLAlchemy 설정"""
+    return {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'SQLALCHEMY_ENGINE_OPTIONS': engine_options(),
+        'SQLALCHEMY_TRACK_MODIFICATIONS': False,
+    }
+
+
+def apply_pragmas(dbapi_connection, connection_record=None):
+    """새 DBAPI 연결에 PRAGMA 적용 (engine 'connect' 이벤트)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def install_pragmas(engine):
+    """엔진의 새 연결마다 PRAGMA가 적용되도록 등록"""
+    if engine.dialect.name == 'sqlite' and not event.contains(engine, 'connect', apply_pragmas):
+        event.listen(engine, 'connect', apply_pragmas)
+
+
+def init_sqlite(app, db):
+    """db.init_app(app) 다음에 호출"""
+    with app.app_context():
+        install_pragmas(db.engine)
+    print(f"🗄️ SQLite 설정: journal_mode={JOURNAL_MODE}, synchronous={SYNCHRONOUS}, "
+          f"busy_timeout={BUSY_TIMEOUT_MS}ms, 풀 {POOL_SIZE}+{POOL_MAX_OVERFLOW}")
+
+
+def sqlite_stats(db):
+    """현재 연결에 실제로 적용된 값 (/health용)"""
+    with db.engine.connect() as conn:
+        raw = conn.connection.dbapi_connection
+        values = {
+            name: raw.execute(f'PRAGMA {name}').fetchone()[0]
+            for name in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'mmap_size', 'temp_store')
+        }
+    pool = db.engine.pool
+    values['pool'] = {
+        'size': POOL_SIZE,
+        'max_overflow': POOL_MAX_OVERFLOW,
+        'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None
+    }
+    return values
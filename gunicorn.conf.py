@@ -0,0 +1,43 @@
+import os
+
+# gunicorn 설정 (gunicorn은 작업 디렉터리의 gunicorn.conf.py를 자동으로 읽는다)
+# 실행: gunicorn app:app
+#
+# 채팅의 LLM 호출은 대부분 OpenAI 응답을 기다리는 시간이라, sync 워커로는 느린 응답 하나가 워커 하나를 통째로 잡는다.
+# gevent 워커는 소켓 대기 중에 다른 요청으로 전환하므로 워커 하나가 수십 개의 LLM 호출을 동시에 들고 있을 수 있다.
+# (openai 클라이언트의 httpx, SQLite, 결정적 라우트는 코드 수정 없이 그대로 동작한다)
+# gevent가 설치되어 있지 않으면 스레드 워커(gthread)로 대신 동시성을 확보한다.
+
+try:
+    import gevent  # noqa: F401
+    _default_worker_class = 'gevent'
+except ImportError:
+    _default_worker_class = 'gthread'
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', _default_worker_class)
+# 무료 인스턴스(메모리 512MB) 기준 1~2개. 데이터 스냅샷/캐시는 워커마다 따로 메모리에 올라간다
+workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+
+# gevent: 워커 하나가 동시에 처리하는 요청(그린렛) 수
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', '100'))
+# gthread: 워커 하나의 스레드 수
+threads = int(os.environ.get('GUNICORN_THREADS', '32'))
+
+# SSE 스트리밍 응답이 길어질 수 있으므로 넉넉하게
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+# 앱을 마스터에서 미리 import하면 gevent 패치 전에 소켓/락이 만들어지므로 워커에서 import한다
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+
+
+def worker_exit(server, worker):
+    """워커 종료 시 write-behind 대기열에 남은 채팅 턴을 모두 저장"""
+    from services.chat_writer import chat_writer
+    chat_writer.close()
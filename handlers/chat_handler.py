@@ -1,148 +1,106 @@
 import os
-import json
+import time
 import openai
 import random
+import threading
 from datetime import datetime
+from flask import current_app
 
-from database.models import db, User, Chat, Message
-from config.predefined_answers import PREDEFINED_ANSWERS
+from database.models import db, Chat, Message, DeletedChat
+from config.space_keywords import KEYWORD_MAPPING, PURPOSE_MAPPING
 from services.youth_space_crawler import search_spaces_by_region, search_spaces_by_keyword
 from services.youth_program_crawler import get_youth_programs_data, search_programs_by_region
+from services.data_snapshot import get_data_snapshot
+from services.aho_corasick import AhoCorasick
+from services.catalog import BUSAN_REGIONS
+from services.space_facets import CAPACITY_OPTIONS, capacity_matches, purpose_matches
+from services.keyword_normalizer import resolve_category
+from services.render_cache import cached_render
+from services.chat_context import (
+    CONTEXT_MAX_MESSAGES, SUMMARY_BATCH_MESSAGES, SUMMARY_MAX_TOKENS, SUMMARY_MODEL,
+    build_history_messages, build_summary_messages
+)
+from services.llm_metrics import llm_usage
+from services.answer_cache import ANSWER_CACHE_ENABLED, answer_cache, answer_cache_key
+from services.single_flight import llm_single_flight, prompt_hash
+from services.llm_admission import LLMBusyError, llm_gate
+from services.llm_resilience import REQUEST_TIMEOUT, guarded_call, llm_breaker
+from services.chat_writer import chat_writer
+from config.llm_prompts import SYSTEM_PROMPT
 from handlers.base_handler import BaseHandler
+from handlers.chat_router import ChatRouter
 
+LLM_MODEL = "gpt-4o"
 
-class ChatHandler(BaseHandler):
-    def __init__(self):
-        print("🚀 ChatHandler 초기화 시작...")
-
-        try:
-            self.client = openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        except Exception as e:
-            self.client = None
-
-        self.spaces_data = self.load_spaces_data()
-        self.centers_data = self.load_centers_data()
-        self.keyword_data = self.load_keyword_data()
-        self.keyword_mapping = self._init_keyword_mapping()
-        self.purpose_mapping = self._init_purpose_mapping()
+# LLM 호출이 몰려서 슬롯을 얻지 못했을 때의 대체 응답 (route='llm_busy')
+LLM_BUSY_REPLY = (
+    "지금 질문이 많아 답변이 늦어지고 있어요. 😥 잠시 후 다시 질문해주세요!\n\n"
+    "그동안 **지역별 센터찾기**, **조건별 대여공간 검색**, **청년공간 프로그램** 메뉴는 바로 이용하실 수 있어요."
+)
 
-        if len(self.centers_data) == 0:
-            import time
-            time.sleep(1)
-            self.centers_data = self.load_centers_data()
+# 자유 입력에 포함되어 있으면 LLM 호출 전에 청년공간 키워드 검색을 먼저 시도하는 단어들
+SPACE_SEARCH_KEYWORDS = ('스터디', '창업', '회의', '카페', '라운지', '센터')
 
-        if self.centers_data:
-            sample_center = self.centers_data[0]
 
-        if self.spaces_data:
-            sample_space = self.spaces_data[0]
+def _condition_cache_key(conditions):
+    """조건별 검색 렌더 캐시 키 (검색에 실제로 쓰이는 값만). 선택지에 없는 값이 섞이면 캐싱하지 않는다"""
+    key = tuple(conditions.get(field, '').strip() for field in ('region', 'capacity', 'purpose'))
+    region, capacity, purpose = key
+    if ((region and region not in BUSAN_REGIONS) or (capacity and capacity not in CAPACITY_OPTIONS)
+            or (purpose and purpose not in PURPOSE_MAPPING)):
+        return None
+    return key
 
 
-    def load_centers_data(self):
-        """youth_spaces_cache.json 데이터 로드 - config 폴더에서만"""
-        try:
-            config_path = self.get_config_path()
-            config_file = os.path.join(config_path, 'youth_spaces_cache.json')
-
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    result = data.get('data', [])
-                    return result
+def _center_cache_key(center_name):
+    """센터 상세 렌더 캐시 키 - 실제 센터 이름일 때만 (자유 입력 '<이름> 상세보기'는 캐싱하지 않는다)"""
+    return (center_name,) if get_data_snapshot().catalog.get_center(center_name) else None
 
-            return []
 
-        except Exception as e:
-            return []
+class ChatHandler(BaseHandler):
+    def __init__(self):
+        print("🚀 ChatHandler 초기화 시작...")
 
-    def load_keyword_data(self):
-        """spaces_busan_keyword.json 데이터 로드"""
         try:
-            config_path = self.get_config_path()
-            keyword_file = os.path.join(config_path, 'spaces_busan_keyword.json')
-
-            if os.path.exists(keyword_file):
-                with open(keyword_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    result = data.get('spaces_busan_keyword', [])
-                    return result
-
-            return []
+            # 재시도/시간 예산은 services/llm_resilience.py에서 관리하므로 클라이언트 자체 재시도는 끈다
+            self.client = openai.OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"), timeout=REQUEST_TIMEOUT, max_retries=0
+            )
         except Exception as e:
-            return []
-
-    def load_overrides_data(self):
-        """youth_spaces_overrides.json 데이터 로드 - config 폴더에서"""
-        try:
-            config_path = self.get_config_path()
-            overrides_file = os.path.join(config_path, 'youth_spaces_overrides.json')
-
-            if os.path.exists(overrides_file):
-                with open(overrides_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data.get('data', [])
-            return []
-        except Exception:
-            return []
-
-    def merge_centers_data(self):
-        """크롤링 데이터와 Override 데이터 병합 (name + region으로 구분)"""
-        try:
-            cache_centers = self.centers_data.copy()
-            override_centers = self.load_overrides_data()
-
-            override_dict = {}
-            for center in override_centers:
-                key = f"{center.get('name', '')}_{center.get('region', '')}"
-                override_dict[key] = center
+            self.client = None
 
-            merged_centers = []
+        self.keyword_mapping = self._init_keyword_mapping()
+        self.purpose_mapping = self._init_purpose_mapping()
+        self.space_keyword_matcher = AhoCorasick((keyword, keyword) for keyword in SPACE_SEARCH_KEYWORDS)
+        self.router = self._init_router()
 
-            for cache_center in cache_centers:
-                center_name = cache_center.get('name', '')
-                center_region = cache_center.get('region', '')
-                key = f"{center_name}_{center_region}"
+        # 백그라운드에서 요약 중인 chat_id (같은 대화를 동시에 두 번 요약하지 않도록)
+        self._summarizing = set()
+        self._summarizing_lock = threading.Lock()
 
-                if key in override_dict:
-                    merged_centers.append(override_dict[key])
-                else:
-                    merged_centers.append(cache_center)
+    @property
+    def spaces_data(self):
+        """spaces_busan_youth.json 대여공간 데이터 (데이터 스냅샷)"""
+        return get_data_snapshot().rental_spaces
 
-            cache_keys = {f"{center.get('name', '')}_{center.get('region', '')}" for center in cache_centers}
-            for override_center in override_centers:
-                override_key = f"{override_center.get('name', '')}_{override_center.get('region', '')}"
-                if override_key not in cache_keys:
-                    merged_centers.append(override_center)
+    @property
+    def centers_data(self):
+        """youth_spaces_cache.json 센터 데이터 (데이터 스냅샷)"""
+        return get_data_snapshot().cache_centers
 
-            return merged_centers
+    @property
+    def keyword_data(self):
+        """spaces_busan_keyword.json 키워드 데이터 (데이터 스냅샷)"""
+        return get_data_snapshot().keyword_data
 
-        except Exception:
-            return self.centers_data
+    def merge_centers_data(self):
+        """크롤링 데이터와 Override 데이터 병합 결과 (스냅샷에 미리 병합됨)"""
+        return list(get_data_snapshot().centers)
 
     def merge_center_data(self, center_name):
-        """특정 센터의 크롤링 데이터 + Override 데이터 + 키워드 데이터 병합"""
-        try:
-            merged_centers = self.merge_centers_data()
-            center_info = None
-
-            for center in merged_centers:
-                if center.get('name') == center_name:
-                    center_info = center.copy()
-                    break
-
-            if not center_info:
-                return None
-
-            for keyword_item in self.keyword_data:
-                if keyword_item.get('parent_facility') == center_name:
-                    center_info['introduction'] = keyword_item.get('introduction', '')
-                    center_info['keywords'] = keyword_item.get('keywords', [])
-                    break
-
-            return center_info
-
-        except Exception:
-            return None
+        """특정 센터의 크롤링 데이터 + Override 데이터 + 키워드 데이터 병합 결과"""
+        center_info = get_data_snapshot().center_details.get(center_name)
+        return dict(center_info) if center_info else None
 
     def get_all_centers_cards(self):
         """33개 센터 카드형 데이터 반환 (Override 적용)"""
@@ -152,6 +110,7 @@ class ChatHandler(BaseHandler):
         except Exception:
             return "33개 센터 정보를 불러오는 중 오류가 발생했습니다."
 
+    @cached_render('center_detail', key=_center_cache_key)
     def get_center_detail_with_spaces(self, center_name):
         """특정 센터 상세 정보 + 대여가능한 공간들 반환 (Override 적용)"""
         try:
@@ -199,15 +158,11 @@ class ChatHandler(BaseHandler):
         except Exception:
             return f"'{center_name}' 센터 정보를 처리하는 중 오류가 발생했습니다."
 
+    @cached_render('space_detail')
     def get_space_detail_by_facility_and_name(self, facility_name, space_name):
         """센터명과 공간명으로 특정 공간 상세 정보 반환"""
         try:
-            target_space = None
-            for space in self.spaces_data:
-                if (space.get('parent_facility') == facility_name and
-                        space.get('space_name') == space_name):
-                    target_space = space
-                    break
+            target_space = get_data_snapshot().catalog.get_rental_space(facility_name, space_name)
 
             if not target_space:
                 return f"'{facility_name}'의 '{space_name}' 공간을 찾을 수 없습니다."
@@ -242,29 +197,11 @@ class ChatHandler(BaseHandler):
 
     def _init_keyword_mapping(self):
         """키워드 매핑 초기화"""
-        return {
-            "📝스터디/회의": ["📝스터디/회의", "📝 스터디/회의", "스터디/회의", "스터디", "회의"],
-            "🎤교육/강연": ["🎤교육/강연", "🏫교육/강연", "🏫 교육/강연", "교육/강연", "교육", "강연"],
-            "👥커뮤니티": ["👥커뮤니티", "👥모임/커뮤니티", "👥 모임/커뮤니티", "모임/커뮤니티", "커뮤니티", "모임"],
-            "🚀진로/창업": ["🚀진로/창업", "🚀 진로/창업", "진로/창업", "진로", "창업"],
-            "🎨문화/창작": ["🎨문화/창작", "🎨 문화/창작", "문화/창작", "문화", "창작"],
-            "🛠작업/창작실": ["🛠작업/창작실", "💻작업/창작실", "💻 작업/창작실", "작업/창작실", "작업", "창작실"],
-            "🧘휴식/놀이": ["🧘휴식/놀이", "🌿휴식/놀이", "🌿 휴식/놀이", "휴식/놀이", "휴식", "놀이"],
-            "🎪행사/이벤트": ["🎪행사/이벤트", "🎬행사/이벤트", "🎬 행사/이벤트", "행사/이벤트", "행사", "이벤트"]
-        }
+        return {keyword: list(variants) for keyword, variants in KEYWORD_MAPPING.items()}
 
     def _init_purpose_mapping(self):
         """목적 매핑 초기화"""
-        return {
-            '스터디/회의': ['📝스터디/회의', '📝 스터디/회의', '스터디', '회의'],
-            '교육/강연': ['🎤교육/강연', '🏫교육/강연', '🏫 교육/강연', '교육', '강연'],
-            '커뮤니티': ['👥커뮤니티', '👥모임/커뮤니티', '👥 모임/커뮤니티', '커뮤니티', '모임'],
-            '진로/창업': ['🚀진로/창업', '🚀 진로/창업', '진로', '창업'],
-            '문화/창작': ['🎨문화/창작', '🎨 문화/창작', '문화', '창작'],
-            '작업/창작실': ['🛠작업/창작실', '💻작업/창작실', '💻 작업/창작실', '작업', '창작실'],
-            '휴식/놀이': ['🧘휴식/놀이', '🌿휴식/놀이', '🌿 휴식/놀이', '휴식', '놀이'],
-            '행사/이벤트': ['🎪행사/이벤트', '🎬행사/이벤트', '🎬 행사/이벤트', '행사', '이벤트']
-        }
+        return {purpose: list(variants) for purpose, variants in PURPOSE_MAPPING.items()}
 
     def format_space_detail(self, space):
         """청년 공간 상세 정보 포맷팅 - 정형화된 형식"""
@@ -307,23 +244,6 @@ class ChatHandler(BaseHandler):
         except Exception:
             return "공간 정보를 불러오는 중 오류가 발생했습니다."
 
-    def load_spaces_data(self):
-        """spaces_busan_youth.json 데이터 로드"""
-        try:
-            config_path = self.get_config_path()
-            spaces_file = os.path.join(config_path, 'spaces_busan_youth.json')
-
-            if os.path.exists(spaces_file):
-                with open(spaces_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    result = data.get('spaces_busan_youth', [])
-                    return result
-
-            return []
-
-        except Exception as e:
-            return []
-
     def extract_link_url(self, link):
         """링크 URL 추출"""
         if isinstance(link, list) and len(link) > 0:
@@ -347,24 +267,11 @@ class ChatHandler(BaseHandler):
             return "인원 제한 없음"
 
     def find_matching_spaces(self, user_input):
-        """사용자 입력과 매칭되는 공간 찾기"""
+        """사용자 입력과 매칭되는 공간 찾기 (입력 안의 공간명/센터명 + 입력을 포함하는 공간명/센터명)"""
         if not self.spaces_data:
             return []
 
-        user_input_lower = user_input.lower()
-        matching_spaces = []
-
-        for space in self.spaces_data:
-            space_name = space.get('space_name', '').lower()
-            parent_facility = space.get('parent_facility', '').lower()
-
-            if (space_name in user_input_lower or
-                    user_input_lower in space_name or
-                    parent_facility in user_input_lower or
-                    user_input_lower in parent_facility):
-                matching_spaces.append(space)
-
-        return matching_spaces
+        return get_data_snapshot().catalog.find_rental_spaces_in_text(user_input)
 
     def handle_space_detail_request(self, user_input):
         """청년 공간 상세 요청 처리"""
@@ -393,19 +300,17 @@ class ChatHandler(BaseHandler):
         except Exception:
             return "청년 공간 상세 정보를 불러오는 중 오류가 발생했습니다."
 
+    @cached_render('all_spaces_detail')
     def show_all_spaces_detail(self):
         """모든 청년 공간을 상세 포맷으로 표시"""
         try:
             result = "**🏢 부산 청년 공간**\n\n"
             result += "아래 공간들 중 원하는 공간명을 입력하시면 더 자세한 정보를 확인할 수 있습니다!\n\n"
 
-            regions = {}
-            for space in self.spaces_data:
-                location = space.get('location', '기타')
-                regions.setdefault(location, []).append(space)
-
-            for region in regions:
-                regions[region].sort(key=lambda x: x.get('parent_facility', ''))
+            regions = {
+                region: sorted(spaces, key=lambda x: x.get('parent_facility', ''))
+                for region, spaces in get_data_snapshot().catalog.rental_spaces_by_region.items()
+            }
 
             for region, spaces in list(regions.items())[:3]:
                 result += f"**📍 {region}**\n"
@@ -437,25 +342,27 @@ class ChatHandler(BaseHandler):
         except Exception:
             return "청년 공간 목록을 불러오는 중 오류가 발생했습니다."
 
+    def _scan_spaces_by_keyword(self, keyword):
+        """표준 카테고리로 정규화되지 않는 키워드는 공간 키워드 원문과 직접 비교"""
+        search_keywords = self.keyword_mapping.get(keyword, [keyword])
+        return [
+            space for space in self.spaces_data
+            if any(search_kw.lower() in space_kw.lower() or space_kw.lower() in search_kw.lower()
+                   for search_kw in search_keywords for space_kw in space.get('keywords', []))
+        ]
+
+    @cached_render('space_keyword')
     def search_spaces_by_keyword_json(self, keyword):
         """JSON 데이터에서 키워드로 공간 검색"""
         try:
             if not self.spaces_data:
                 return "❌ 청년 공간 데이터를 불러올 수 없습니다."
 
-            search_keywords = self.keyword_mapping.get(keyword, [keyword])
-            filtered_spaces = []
-
-            for space in self.spaces_data:
-                space_keywords = space.get('keywords', [])
-                for search_kw in search_keywords:
-                    for space_kw in space_keywords:
-                        if search_kw.lower() in space_kw.lower() or space_kw.lower() in search_kw.lower():
-                            filtered_spaces.append(space)
-                            break
-                    else:
-                        continue
-                    break
+            category = resolve_category(keyword)
+            if category:
+                filtered_spaces = get_data_snapshot().catalog.get_rental_spaces_by_category(category)
+            else:
+                filtered_spaces = self._scan_spaces_by_keyword(keyword)
 
             if not filtered_spaces:
                 return (f"{keyword}로 검색할 수 있는 공간을 찾아보겠습니다.\n\n"
@@ -503,6 +410,7 @@ class ChatHandler(BaseHandler):
 
         return conditions
 
+    @cached_render('condition_search', key=_condition_cache_key)
     def handle_space_reservation_search(self, conditions):
         """조건별 청년 공간 검색"""
         try:
@@ -534,85 +442,33 @@ class ChatHandler(BaseHandler):
             return "검색 중 오류가 발생했습니다. 다시 시도해주세요."
 
     def filter_spaces_by_conditions(self, region, capacity, purpose):
-        """조건에 따른 공간 필터링"""
-        filtered_spaces = []
+        """조건에 따른 공간 필터링 (미리 계산된 비트셋 AND)"""
+        match_reasons = []
+        if region: match_reasons.append(f"지역: {region}")
+        if capacity: match_reasons.append(f"인원: {capacity}")
+        if purpose: match_reasons.append(f"목적: {purpose}")
 
-        for space in self.spaces_data:
-            conditions_met = []
-
-            if region:
-                if space.get('location') == region:
-                    conditions_met.append('region')
-                else:
-                    continue
-
-            if capacity:
-                if self.check_capacity_match(space, capacity):
-                    conditions_met.append('capacity')
-                else:
-                    continue
-
-            if purpose:
-                if self.check_purpose_match(space, purpose):
-                    conditions_met.append('purpose')
-                else:
-                    continue
-
-            selected_conditions = []
-            if region: selected_conditions.append('region')
-            if capacity: selected_conditions.append('capacity')
-            if purpose: selected_conditions.append('purpose')
-
-            if set(selected_conditions) == set(conditions_met):
-                space_copy = space.copy()
-                space_copy['match_score'] = len(conditions_met)
-                space_copy['match_reasons'] = []
-                if region: space_copy['match_reasons'].append(f"지역: {region}")
-                if capacity: space_copy['match_reasons'].append(f"인원: {capacity}")
-                if purpose: space_copy['match_reasons'].append(f"목적: {purpose}")
-                filtered_spaces.append(space_copy)
+        filtered_spaces = []
+        for space in get_data_snapshot().catalog.space_facets.filter(region, capacity, purpose):
+            space_copy = space.copy()
+            space_copy['match_score'] = len(match_reasons)
+            space_copy['match_reasons'] = list(match_reasons)
+            filtered_spaces.append(space_copy)
 
         return filtered_spaces
 
     def check_capacity_match(self, space, selected_capacity):
         """인원 조건 매칭 확인"""
-        try:
-            capacity_min = space.get('capacity_min')
-            capacity_max = space.get('capacity_max')
-
-            if not capacity_min and not capacity_max:
-                return True
-
-            capacity_checks = {
-                '1-2명': lambda: capacity_min is None or capacity_min <= 2,
-                '3-6명': lambda: (capacity_min is None or capacity_min <= 6) and (
-                        capacity_max is None or capacity_max >= 3),
-                '7명이상': lambda: capacity_max is None or capacity_max >= 7,
-                '상관없음': lambda: True
-            }
-
-            return capacity_checks.get(selected_capacity, lambda: False)()
-
-        except Exception:
-            return True
+        return capacity_matches(space, selected_capacity)
 
     def check_purpose_match(self, space, selected_purpose):
-        """목적 조건 매칭 확인"""
-        try:
-            space_keywords = space.get('keywords', [])
-            if not space_keywords:
-                return False
-
-            search_keywords = self.purpose_mapping.get(selected_purpose, [selected_purpose])
+        """목적 조건 매칭 확인 (공간 키워드를 표준 카테고리로 정규화해서 비교)"""
+        category = resolve_category(selected_purpose)
+        if not category:
+            return purpose_matches(space, selected_purpose, self.purpose_mapping)
 
-            for search_kw in search_keywords:
-                for space_kw in space_keywords:
-                    if search_kw.lower() in space_kw.lower() or space_kw.lower() in search_kw.lower():
-                        return True
-
-            return False
-        except Exception:
-            return False
+        normalizer = get_data_snapshot().catalog.keyword_normalizer
+        return category in normalizer.categories_of_all(space.get('keywords', []))
 
     def format_search_results(self, spaces, region, capacity, purpose):
         """검색 결과 포맷팅 - 버튼 추가"""
@@ -689,8 +545,8 @@ class ChatHandler(BaseHandler):
         except Exception:
             return "랜덤 추천 중 오류가 발생했습니다."
 
-    def process_chat_message(self, user_message_text, anonymous_id, chat_id):
-        """채팅 메시지 처리"""
+    def process_chat_message(self, user_message_text, anonymous_id, chat_id, use_cache=True):
+        """채팅 메시지 처리 (use_cache=False면 LLM 답변 캐시를 건너뜀)"""
         if not self.client:
             return {"error": "OpenAI API 키가 설정되지 않았습니다."}, 500
 
@@ -698,43 +554,69 @@ class ChatHandler(BaseHandler):
             return {"error": "필수 정보가 누락되었습니다."}, 400
 
         try:
-            user = User.query.filter_by(anonymous_id=anonymous_id).first()
-            if not user:
-                user = User(anonymous_id=anonymous_id)
-                db.session.add(user)
-                db.session.commit()
+            received_at = datetime.utcnow()
 
-            chat_session = Chat.query.filter_by(id=chat_id).first()
-            if not chat_session:
-                chat_session = Chat(id=chat_id, user_id=user.id, title=user_message_text)
-                db.session.add(chat_session)
-                db.session.commit()
+            bot_reply, route = self.generate_bot_response_with_route(user_message_text, chat_id, use_cache)
 
-            if len(chat_session.messages) == 0 and user_message_text not in PREDEFINED_ANSWERS:
-                chat_session.title = user_message_text
-                db.session.commit()
+            # 응답을 만든 뒤에 저장하므로 LLM 호출 동안 SQLite 쓰기 잠금을 잡고 있지 않는다
+            chat_writer.save_turn(user_message_text, anonymous_id, chat_id, bot_reply, route, received_at)
 
-            user_message = Message(chat_id=chat_id, sender='user', text=user_message_text)
-            db.session.add(user_message)
-            db.session.commit()
+            return {"success": True, "reply": bot_reply, "route": route}, 200
 
-            bot_reply = self.generate_bot_response(user_message_text, chat_id)
+        except Exception as e:
+            db.session.rollback()
+            return {"error": "채팅 처리 중 오류가 발생했습니다."}, 500
 
-            bot_message = Message(chat_id=chat_id, sender='bot', text=bot_reply)
-            db.session.add(bot_message)
-            db.session.commit()
+    def stream_chat_message(self, user_message_text, anonymous_id, chat_id, use_cache=True):
+        """스트리밍 채팅 처리 - (이벤트 이름, 데이터) 를 순서대로 yield
+
+        - 결정적 라우트: 'message' 한 번 (전체 응답)
+        - LLM 응답: OpenAI 스트림 조각마다 'delta'
+        - 끝나면 대화를 저장하고 'done', 실패 시 'error'
+        """
+        if not self.client:
+            yield 'error', {"error": "OpenAI API 키가 설정되지 않았습니다."}
+            return
 
-            return {"success": True, "reply": bot_reply}, 200
+        if not all([user_message_text, anonymous_id, chat_id]):
+            yield 'error', {"error": "필수 정보가 누락되었습니다."}
+            return
+
+        try:
+            received_at = datetime.utcnow()
+
+            route, bot_reply = self.router.dispatch(user_message_text)
+            if route:
+                yield 'message', {"reply": bot_reply, "route": route}
+            else:
+                route = 'llm'
+                chunks = []
+                try:
+                    for delta in self.stream_llm_response(user_message_text, chat_id, use_cache):
+                        chunks.append(delta)
+                        yield 'delta', {"text": delta}
+                    bot_reply = ''.join(chunks)
+                except LLMBusyError:
+                    route, bot_reply = 'llm_busy', LLM_BUSY_REPLY
+                    yield 'message', {"reply": bot_reply, "route": route}
+
+            # 응답을 만든 뒤에 저장하므로 LLM 호출 동안 SQLite 쓰기 잠금을 잡고 있지 않는다
+            chat_writer.save_turn(user_message_text, anonymous_id, chat_id, bot_reply, route, received_at)
+
+            yield 'done', {"success": True, "route": route}
 
         except Exception as e:
             db.session.rollback()
-            return {"error": "채팅 처리 중 오류가 발생했습니다."}, 500
+            yield 'error', {"error": "채팅 처리 중 오류가 발생했습니다."}
 
     def delete_chat_session(self, chat_id):
         """채팅 세션 삭제"""
         try:
+            chat_writer.flush_for_chat(chat_id)
             chat_to_delete = Chat.query.filter_by(id=chat_id).first()
             if chat_to_delete:
+                # 다른 기기의 증분 동기화(/api/history/<id>/sync)가 삭제를 알 수 있도록 같은 트랜잭션에 기록
+                db.session.add(DeletedChat(user_id=chat_to_delete.user_id, chat_id=chat_to_delete.id))
                 db.session.delete(chat_to_delete)
                 db.session.commit()
                 return {"message": "채팅이 성공적으로 삭제되었습니다."}, 200
@@ -744,135 +626,319 @@ class ChatHandler(BaseHandler):
             db.session.rollback()
             return {"error": "채팅 삭제 중 오류가 발생했습니다."}, 500
 
-    def generate_bot_response(self, user_message_text, chat_id):
-        """봇 응답 생성 로직"""
-        special_commands = {
-            "청년 공간 상세": "[SPACE_DETAIL_SEARCH]",
-            "청년 공간 프로그램 확인하기": "[PROGRAM_REGIONS]",
-            "✨ 랜덤 추천": self.handle_random_recommendation(),
-            "34개 센터 전체보기": self.get_all_centers_cards()
-        }
+    def _init_router(self):
+        """결정적 응답 라우팅 테이블 초기화 (LLM 호출 전에 검사)"""
+        router = ChatRouter()
 
-        if user_message_text in special_commands:
-            command_result = special_commands[user_message_text]
-            result = command_result() if callable(command_result) else command_result
-            return result
+        router.add_exact("청년 공간 상세", 'space_detail_search', lambda text: "[SPACE_DETAIL_SEARCH]")
+        router.add_exact("청년 공간 프로그램 확인하기", 'program_regions', lambda text: "[PROGRAM_REGIONS]")
+        router.add_exact("✨ 랜덤 추천", 'random_recommendation', lambda text: self.handle_random_recommendation())
+        router.add_exact("34개 센터 전체보기", 'center_list', lambda text: self.get_all_centers_cards())
 
-        if user_message_text.endswith(' 상세보기'):
-            center_name = user_message_text.replace(' 상세보기', '').strip()
+        for region in BUSAN_REGIONS:
+            router.add_exact(region, 'space_region', search_spaces_by_region, strip=True)
 
-            merged_centers = self.merge_centers_data()
-            if merged_centers:
-                center_names = [center.get('name', '') for center in merged_centers[:3]]
+        for keyword in self.keyword_mapping:
+            router.add_exact(keyword, 'space_keyword', self.search_spaces_by_keyword_json, strip=True)
 
-            result = self.get_center_detail_with_spaces(center_name)
-            return result
+        old_keyword_mapping = {
+            '스터디/회의': '📝스터디/회의', '교육/강연': '🎤교육/강연',
+            '모임/커뮤니티': '👥커뮤니티', '진로/창업': '🚀진로/창업',
+            '문화/창작': '🎨문화/창작', '작업/창작실': '🛠작업/창작실',
+            '휴식/놀이': '🧘휴식/놀이', '행사/이벤트': '🎪행사/이벤트'
+        }
+        for old_keyword, new_keyword in old_keyword_mapping.items():
+            router.add_exact(old_keyword, 'space_keyword',
+                             lambda text, keyword=new_keyword: self.search_spaces_by_keyword_json(keyword), strip=True)
 
-        if '-' in user_message_text and user_message_text.endswith(' 상세보기'):
-            space_detail = user_message_text.replace(' 상세보기', '').strip()
-            if '-' in space_detail:
-                parts = space_detail.split('-', 1)
-                if len(parts) == 2:
-                    facility_name = parts[0].strip()
-                    space_name = parts[1].strip()
-                    result = self.get_space_detail_by_facility_and_name(facility_name, space_name)
-                    return result
-
-        if "조건별 검색:" in user_message_text:
-            try:
-                conditions = self.parse_search_conditions(user_message_text)
-                result = self.handle_space_reservation_search(conditions)
-                return result
-            except Exception as e:
-                return "검색 조건 처리 중 오류가 발생했습니다."
+        router.add_suffix(' 상세보기', 'detail_view', self._route_detail_view)
+        router.add_contains("조건별 검색:", 'condition_search', self._route_condition_search)
+        router.add_contains(" 프로그램", 'program_region', self._route_program_region)
+        router.add_rule('space_keyword_search', self.space_keyword_matcher.contains_any, self._route_space_keyword_search)
 
-        if " 프로그램" in user_message_text:
-            region = user_message_text.replace(" 프로그램", "").strip()
-            regions = ['중구', '동구', '서구', '영도구', '부산진구', '동래구', '연제구',
-                       '금정구', '북구', '사상구', '사하구', '강서구', '남구', '해운대구', '수영구', '기장군']
+        return router
 
-            if region in regions:
-                result = search_programs_by_region(region)
-                return result
+    def _route_detail_view(self, target_name):
+        """'<센터명> 상세보기' / '<센터명>-<공간명> 상세보기' 처리"""
+        catalog = get_data_snapshot().catalog
+        if '-' in target_name and not catalog.get_center(target_name):
+            facility_name, space_name = (part.strip() for part in target_name.split('-', 1))
+            if catalog.get_rental_space(facility_name, space_name):
+                return self.get_space_detail_by_facility_and_name(facility_name, space_name)
 
-        regions = ['중구', '동구', '서구', '영도구', '부산진구', '동래구', '연제구',
-                   '금정구', '북구', '사상구', '사하구', '강서구', '남구', '해운대구', '수영구', '기장군']
+        return self.get_center_detail_with_spaces(target_name)
 
-        if user_message_text.strip() in regions:
-            result = search_spaces_by_region(user_message_text.strip())
-            return result
+    def _route_condition_search(self, user_message_text):
+        try:
+            conditions = self.parse_search_conditions(user_message_text)
+            return self.handle_space_reservation_search(conditions)
+        except Exception:
+            return "검색 조건 처리 중 오류가 발생했습니다."
 
-        keyword_list = list(self.keyword_mapping.keys())
-        if user_message_text.strip() in keyword_list:
-            result = self.search_spaces_by_keyword_json(user_message_text.strip())
+    def _route_program_region(self, user_message_text):
+        region = user_message_text.replace(" 프로그램", "").strip()
+        if region in BUSAN_REGIONS:
+            return search_programs_by_region(region)
+        return None
+
+    def _route_space_keyword_search(self, user_message_text):
+        result = search_spaces_by_keyword(user_message_text)
+        if '찾을 수 없습니다' not in result:
             return result
+        return None
 
-        old_keyword_mapping = {
-            '스터디/회의': '📝스터디/회의', '교육/강연': '🎤교육/강연',
-            '모임/커뮤니티': '👥커뮤니티', '진로/창업': '🚀진로/창업',
-            '문화/창작': '🎨문화/창작', '작업/창작실': '🛠작업/창작실',
-            '휴식/놀이': '🧘휴식/놀이', '행사/이벤트': '🎪행사/이벤트'
-        }
+    def generate_bot_response(self, user_message_text, chat_id):
+        """봇 응답 생성 로직"""
+        reply, _ = self.generate_bot_response_with_route(user_message_text, chat_id)
+        return reply
 
-        if user_message_text.strip() in old_keyword_mapping:
-            new_keyword = old_keyword_mapping[user_message_text.strip()]
-            result = self.search_spaces_by_keyword_json(new_keyword)
-            return result
+    def generate_bot_response_with_route(self, user_message_text, chat_id, use_cache=True):
+        """봇 응답 생성 - (응답, 매칭된 라우트 이름) 반환. 결정적 라우트가 없으면 'llm'"""
+        route, result = self.router.dispatch(user_message_text)
+        if route:
+            return result, route
 
-        if any(keyword in user_message_text for keyword in ['스터디', '창업', '회의', '카페', '라운지', '센터']):
-            result = search_spaces_by_keyword(user_message_text)
-            if '찾을 수 없습니다' not in result:
-                return result
+        try:
+            return self.generate_llm_response(user_message_text, chat_id, use_cache), 'llm'
+        except LLMBusyError:
+            return LLM_BUSY_REPLY, 'llm_busy'
+
+    def _build_llm_messages(self, user_message_text, chat_id):
+        """LLM 요청 메시지: 고정 시스템 프롬프트 → (요약) → 이전 대화 → 현재 사용자 메시지
+
+        시스템 프롬프트는 매 요청 바이트 단위로 동일해서 OpenAI 프롬프트 캐시가 적용된다.
+        """
+        chat_writer.flush_for_chat(chat_id)
+
+        summary, summary_until = None, 0
+        chat_session = db.session.get(Chat, chat_id)
+        if chat_session:
+            summary, summary_until = chat_session.summary, chat_session.summary_until or 0
+
+        # 전체 대화가 아니라 요약 이후의 최근 메시지만 (최신순) 가져와서 토큰 예산 안에서 맥락을 만든다
+        recent_messages = Message.query.filter(
+            Message.chat_id == chat_id, Message.id > summary_until
+        ).order_by(Message.id.desc()).limit(CONTEXT_MAX_MESSAGES).all()
+
+        # 맥락 창이 가득 찼으면 밀려난 메시지가 있을 수 있다 - 요약은 백그라운드에서 갱신하고 이번 요청은 기존 요약을 쓴다
+        if chat_session and len(recent_messages) >= CONTEXT_MAX_MESSAGES:
+            self._schedule_rolling_summary(chat_id)
+
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            *build_history_messages(summary, recent_messages),
+            {"role": "user", "content": user_message_text}
+        ]
+
+    def _schedule_rolling_summary(self, chat_id):
+        """요약 갱신을 사용자 요청 밖의 스레드(gevent에서는 그린렛)에서 실행 - 같은 대화는 한 번에 하나만"""
+        with self._summarizing_lock:
+            if chat_id in self._summarizing:
+                return
+            self._summarizing.add(chat_id)
+
+        app = current_app._get_current_object()
+        threading.Thread(target=self._run_rolling_summary, args=(app, chat_id), daemon=True).start()
+
+    def _run_rolling_summary(self, app, chat_id):
+        try:
+            # 앱 컨텍스트가 끝나면 이 스레드의 DB 세션도 정리된다
+            with app.app_context():
+                self._update_rolling_summary(chat_id)
+        finally:
+            with self._summarizing_lock:
+                self._summarizing.discard(chat_id)
+
+    def _update_rolling_summary(self, chat_id):
+        """맥락 창 밖으로 밀려난 메시지가 충분히 쌓였으면 Chat.summary에 접어 넣는다 (실패해도 무시)"""
+        try:
+            chat_session = db.session.get(Chat, chat_id)
+            if not chat_session:
+                return
+
+            overflow = Message.query.filter(
+                Message.chat_id == chat_session.id, Message.id > (chat_session.summary_until or 0)
+            ).order_by(Message.id.desc()).offset(CONTEXT_MAX_MESSAGES).all()
+            if len(overflow) < SUMMARY_BATCH_MESSAGES:
+                return
+
+            overflow.reverse()
+            previous_until = chat_session.summary_until or 0
+            summary_messages = build_summary_messages(chat_session.summary, overflow)
+            summary_until = overflow[-1].id
+            self._release_db_session()
+
+            # 요약은 생략해도 되므로 슬롯이 없으면 기다리지 않고 다음 기회로 미룬다
+            with llm_gate.try_slot() as acquired:
+                if not acquired:
+                    return
+                started = time.time()
+                response = guarded_call(lambda timeout: self.client.chat.completions.create(
+                    model=SUMMARY_MODEL,
+                    messages=summary_messages,
+                    max_tokens=SUMMARY_MAX_TOKENS,
+                    timeout=timeout
+                ))
+            llm_usage.record(SUMMARY_MODEL, response.usage, time.time() - started)
+
+            # 요약하는 동안 다른 워커가 먼저 갱신했거나 대화가 삭제됐으면 버린다
+            chat_session = db.session.get(Chat, chat_id)
+            if not chat_session or (chat_session.summary_until or 0) != previous_until:
+                return
+            chat_session.summary = response.choices[0].message.content.strip()
+            chat_session.summary_until = summary_until
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"⚠️ 대화 요약 갱신 실패: {e}")
 
+    def _release_db_session(self):
+        """프롬프트를 만든 뒤 DB 연결을 풀에 돌려준다
+
+        LLM 호출/스트림은 수십 초 걸릴 수 있어서 그동안 연결을 잡고 있으면 gevent 워커의
+        다른 요청(결정적 라우트, 히스토리)이 풀을 기다리다 실패한다. 이후 저장은 새 세션으로 한다.
+        """
+        db.session.commit()
+        db.session.remove()
+
+    def _answer_cache_key(self, messages, use_cache):
+        """LLM 답변 캐시 키 (캐시를 쓰지 않으면 None)"""
+        if not ANSWER_CACHE_ENABLED:
+            return None
+        if not use_cache:
+            answer_cache.record_bypass()
+            return None
+        return answer_cache_key(LLM_MODEL, messages, get_data_snapshot().digest)
+
+    def generate_llm_response(self, user_message_text, chat_id, use_cache=True):
+        """결정적 라우트로 처리되지 않은 메시지에 대한 LLM 응답"""
         try:
-            all_previous_messages = Message.query.filter_by(chat_id=chat_id).order_by(
-                Message.created_at.asc()).all()
-            conversation_context = "\n".join(
-                [f"{'사용자' if msg.sender == 'user' else '챗봇'}: {msg.text}" for msg in all_previous_messages])
-
-            system_prompt = f"""
-    # 페르소나 (Persona)
-    너는 부산시 청년들을 위한 청년 공간 정보 전문가, **'B-BOT'**이다. 너의 목표는 청년들의 청년 공간 관련 질문에 **명확하고, 정확하며, 도움이 되는 정보**를 제공하여 그들이 청년 공간을 잘 활용할 수 있도록 돕는 것이다.
-
-    # 핵심 지침 (Core Instructions)
-    1. **정보 제공 우선순위:** 
-       - **1순위: 부산 청년 공간 관련 정보** (부산청년센터, 청년두드림카페, 소담스퀘어 등)
-       - **2순위: [이전 대화 맥락]**: 대화의 흐름을 파악하고 사용자의 이전 질문과 관련된 답변을 할 때 참고하라.
-       - **3순위: 너의 일반 지식**: 위 정보들로 답변할 수 없는 일반적인 질문이나 대화에만 너의 내부 지식을 사용하라.
-
-    2. **정확성과 정직성:**
-       - 주어진 정보에 명시되지 않은 내용은 절대로 추측하지 마라.
-       - 모르는 정보에 대해서는 솔직하게 말하고 유용한 대안을 제시하라.
-
-    3. **어조 및 스타일:**
-       - 항상 긍정적이고 친절하며, 청년들을 격려하고 응원하는 따뜻한 말투를 유지하라.
-       - 사용자의 상황에 공감하며 대화하는 느낌을 주어야 한다.
-
-    # 출력 형식 (Output Formatting)
-    - 모든 답변은 **마크다운(Markdown)**을 사용하여 구조화하라.
-    - **핵심 정보**는 `**굵은 글씨**`로 강조하라.
-    - **항목 나열** 시에는 글머리 기호(`-` 또는 `*`)를 사용하라.
-    - **링크 제공** 시에는 전체 URL 주소를 보여주라.
-
-    # 참고 자료 (Context)
-    ---
-    [이전 대화 맥락]
-    {conversation_context if conversation_context else "아직 대화 기록이 없습니다."}
-    ---
-    """
-
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message_text}
-                ]
+            messages = self._build_llm_messages(user_message_text, chat_id)
+            self._release_db_session()
+            cache_key = self._answer_cache_key(messages, use_cache)
+            cached = answer_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                return cached
+
+            # 같은 프롬프트로 진행 중인 호출이 있으면 그 결과를 같이 쓴다
+            return llm_single_flight.do(
+                prompt_hash(LLM_MODEL, messages),
+                lambda: self._complete_llm(messages, cache_key)
             )
-            result = response.choices[0].message.content
-            return result
+
+        except LLMBusyError:
+            raise
 
         except Exception as e:
             return "죄송합니다, 답변 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
 
+    def _complete_llm(self, messages, cache_key):
+        """OpenAI 호출 (single-flight 리더만 실행)"""
+        # 워커 간 잠금을 기다리는 동안 다른 워커가 같은 답변을 캐시에 넣었을 수 있다
+        if cache_key and llm_single_flight.cross_process:
+            cached = answer_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        with llm_gate.slot():
+            started = time.time()
+            response = guarded_call(lambda timeout: self.client.chat.completions.create(
+                model=LLM_MODEL,
+                messages=messages,
+                timeout=timeout
+            ))
+        llm_usage.record(LLM_MODEL, response.usage, time.time() - started)
+        result = response.choices[0].message.content
+        if cache_key and result:
+            answer_cache.put(cache_key, result)
+        return result
 
-chat_handler = ChatHandler()
\ No newline at end of file
+    def stream_llm_response(self, user_message_text, chat_id, use_cache=True):
+        """generate_llm_response의 스트리밍 버전 - 응답 텍스트 조각을 도착하는 대로 yield
+
+        같은 프롬프트를 다른 요청이 스트리밍 중이면 OpenAI를 다시 호출하지 않고 완성된 답변을 한 번에 보낸다.
+        LLM 호출 슬롯을 얻지 못하면 첫 조각을 보내기 전에 LLMBusyError를 던진다.
+        """
+        try:
+            messages = self._build_llm_messages(user_message_text, chat_id)
+            self._release_db_session()
+            cache_key = self._answer_cache_key(messages, use_cache)
+            cached = answer_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                yield cached
+                return
+
+            flight_key = prompt_hash(LLM_MODEL, messages)
+            call, is_leader = llm_single_flight.begin(flight_key)
+            if not is_leader:
+                result = llm_single_flight.wait(call)
+                if result is not None:
+                    yield result
+                    return
+
+        except Exception as e:
+            yield "죄송합니다, 답변 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
+            return
+
+        chunks = []
+        completed = False
+        try:
+            if is_leader:
+                with llm_single_flight.process_lock(flight_key):
+                    yield from self._stream_llm(messages, cache_key, chunks)
+            else:
+                # 리더 실패/시간 초과 - 직접 호출한다
+                yield from self._stream_llm(messages, cache_key, chunks)
+            completed = True
+
+        except LLMBusyError:
+            raise
+
+        except Exception as e:
+            yield "죄송합니다, 답변 생성 중 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
+
+        finally:
+            # 클라이언트가 중간에 연결을 끊어도 기다리는 요청들이 시간 초과까지 멈춰있지 않도록 반드시 끝낸다
+            if is_leader:
+                llm_single_flight.finish(flight_key, call, result=''.join(chunks) if completed and chunks else None)
+
+    def _stream_llm(self, messages, cache_key, chunks):
+        """OpenAI 스트리밍 호출 - 받은 조각을 chunks에 모으면서 yield"""
+        if cache_key and llm_single_flight.cross_process:
+            cached = answer_cache.get(cache_key)
+            if cached is not None:
+                chunks.append(cached)
+                yield cached
+                return
+
+        # 스트림이 끝날 때까지 슬롯을 잡고 있는다
+        with llm_gate.slot():
+            started = time.time()
+            # 재시도는 첫 조각을 받기 전(연결/요청 단계)까지만 한다
+            stream = guarded_call(lambda timeout: self.client.chat.completions.create(
+                model=LLM_MODEL,
+                messages=messages,
+                stream=True,
+                # 마지막 청크로 토큰 사용량(캐시 적중 토큰 포함)을 받는다
+                stream_options={"include_usage": True},
+                timeout=timeout
+            ))
+            try:
+                for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        chunks.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
+                    if chunk.usage:
+                        llm_usage.record(LLM_MODEL, chunk.usage, time.time() - started)
+            except openai.APIError:
+                llm_breaker.record_failure()
+                raise
+            finally:
+                # 클라이언트가 중간에 연결을 끊은 경우에도 OpenAI 스트림을 닫는다
+                stream.close()
+
+        if cache_key and chunks:
+            answer_cache.put(cache_key, ''.join(chunks))
+
+chat_handler = ChatHandler()
@@ -0,0 +1,57 @@
+# 버튼/정해진 문구에 대한 결정적(deterministic) 응답 라우팅 테이블.
+# 메시지마다 모든 응답을 미리 만들어두지 않고, 매칭된 라우트의 핸들러만 호출한다.
+# 핸들러가 None을 반환하면 "이 라우트에서는 처리하지 않음"으로 보고 다음 규칙으로 넘어간다.
+
+
+class ChatRouter:
+    """정확 일치 dict + 순서 있는 규칙(접미사/포함/조건) 목록으로 구성된 라우터
+
+    조회 순서: 원문 정확 일치 → 공백 제거 후 정확 일치 → 규칙(등록 순서)
+    """
+
+    def __init__(self):
+        self._exact = {}
+        self._exact_stripped = {}
+        self._rules = []
+
+    def add_exact(self, text, name, handler, strip=False):
+        """text와 정확히 같은 메시지 → handler(text). strip=True면 앞뒤 공백을 제거한 메시지로 비교"""
+        table = self._exact_stripped if strip else self._exact
+        table[text] = (name, handler)
+
+    def add_suffix(self, suffix, name, handler):
+        """suffix로 끝나는 메시지 → handler(suffix를 뺀 나머지)"""
+        self._rules.append((
+            name,
+            lambda text: text.endswith(suffix),
+            lambda text: handler(text.replace(suffix, '').strip())
+        ))
+
+    def add_contains(self, token, name, handler):
+        """token을 포함하는 메시지 → handler(메시지)"""
+        self._rules.append((name, lambda text: token in text, handler))
+
+    def add_rule(self, name, predicate, handler):
+        """predicate(메시지)가 참이면 → handler(메시지)"""
+        self._rules.append((name, predicate, handler))
+
+    def dispatch(self, text):
+        """(라우트 이름, 응답) 반환. 처리할 라우트가 없으면 (None, None)"""
+        route = self._exact.get(text)
+        if route:
+            name, handler = route
+            return name, handler(text)
+
+        stripped = text.strip()
+        route = self._exact_stripped.get(stripped)
+        if route:
+            name, handler = route
+            return name, handler(stripped)
+
+        for name, predicate, handler in self._rules:
+            if predicate(text):
+                result = handler(text)
+                if result is not None:
+                    return name, result
+
+        return None, None
@@ -7,6 +7,7 @@ from services.youth_program_crawler import (
     search_programs_by_region,
     BusanYouthProgramCrawler
 )
+from services.data_snapshot import get_data_snapshot
 from handlers.base_handler import BaseHandler
 
 
@@ -29,10 +30,9 @@ class ProgramHandler(BaseHandler):
         """지역별 프로그램 검색"""
         try:
             result_message = search_programs_by_region(region)
-            programs = get_youth_programs_data()
 
             region_normalized = region.replace('구', '') if region.endswith('구') else region
-            filtered_programs = self._filter_programs_by_region(programs, region_normalized)
+            filtered_programs = self._filter_programs_by_region(region_normalized)
 
             return {
                 'success': True,
@@ -44,20 +44,9 @@ class ProgramHandler(BaseHandler):
         except Exception as e:
             return self.handle_error(e, f'{region} 지역의 프로그램 정보를 가져오는')
 
-    def _filter_programs_by_region(self, programs, region_normalized):
-        """지역별 프로그램 필터링"""
-        filtered_programs = []
-        for program in programs:
-            program_fields = [
-                program.get('region', ''),
-                program.get('location', ''),
-                program.get('title', '')
-            ]
-
-            if any(region_normalized in field for field in program_fields):
-                filtered_programs.append(program)
-
-        return filtered_programs
+    def _filter_programs_by_region(self, region_normalized):
+        """지역별 프로그램 필터링 (region/location/title 부분 일치, n-gram 인덱스 사용)"""
+        return get_data_snapshot().catalog.program_search.search(region_normalized)
 
     def crawl_programs_manually(self):
         """수동 프로그램 크롤링 - config 폴더에 저장"""
@@ -90,19 +79,14 @@ class ProgramHandler(BaseHandler):
     def search_programs_by_keyword(self, keyword):
         """키워드별 프로그램 검색"""
         try:
-            programs = get_youth_programs_data()
-            if not programs:
+            snapshot = get_data_snapshot()
+            if not snapshot.programs:
                 return {
                     'success': False,
                     'message': '현재 프로그램 정보를 가져올 수 없습니다.'
                 }
 
-            keyword_lower = keyword.lower()
-            filtered_programs = [
-                program for program in programs
-                if any(keyword_lower in str(program.get(field, '')).lower()
-                       for field in ['title', 'location', 'region'])
-            ]
+            filtered_programs = snapshot.catalog.program_search.search(keyword)
 
             return {
                 'success': True,
@@ -1,7 +1,7 @@
 import json
 import os
 from datetime import datetime
-from services.youth_space_crawler import get_youth_spaces_data
+from services.data_snapshot import get_data_snapshot
 from handlers.base_handler import BaseHandler
 
 
@@ -10,49 +10,12 @@ class SpaceHandler(BaseHandler):
         pass
 
     def load_overrides_data(self):
-        """youth_spaces_overrides.json 데이터 로드 (config/ 우선, instance/ 폴백)"""
-        for base_path in [self.get_config_path(), self.get_instance_path()]:
-            overrides_file = os.path.join(base_path, 'youth_spaces_overrides.json')
-            try:
-                if os.path.exists(overrides_file):
-                    with open(overrides_file, 'r', encoding='utf-8') as f:
-                        return json.load(f).get('data', [])
-            except Exception:
-                continue
-        return []
-
-    def merge_spaces_data(self, cache_spaces, override_spaces):
-        """캐시 데이터와 Override 데이터 병합 (override에 removed:true가 있으면 제외)"""
-        merged_spaces = []
-
-        override_dict = {space.get('name', ''): space for space in override_spaces}
-
-        for cache_space in cache_spaces:
-            space_name = cache_space.get('name', '')
-            if space_name in override_dict:
-                override_space = override_dict[space_name]
-                if not override_space.get('removed'):
-                    merged_spaces.append(override_space)
-            else:
-                merged_spaces.append(cache_space)
-
-        cache_names = {space.get('name', '') for space in cache_spaces}
-        for override_space in override_spaces:
-            if override_space.get('name', '') not in cache_names and not override_space.get('removed'):
-                merged_spaces.append(override_space)
-
-        return merged_spaces
+        """youth_spaces_overrides.json 데이터 (데이터 스냅샷에서 읽음)"""
+        return list(get_data_snapshot().override_centers)
 
     def get_merged_spaces_data(self):
-        """캐시 데이터와 Override 데이터를 병합하여 반환"""
-        try:
-            cache_spaces = get_youth_spaces_data()
-            override_spaces = self.load_overrides_data()
-            merged_spaces = self.merge_spaces_data(cache_spaces, override_spaces)
-
-            return merged_spaces
-        except Exception:
-            return get_youth_spaces_data()
+        """캐시 데이터와 Override 데이터를 병합하여 반환 (스냅샷에 미리 병합된 결과)"""
+        return list(get_data_snapshot().centers)
 
     def get_all_spaces(self):
         """전체 청년공간 목록 (Override 적용)"""
@@ -86,13 +49,7 @@ class SpaceHandler(BaseHandler):
     def get_space_detail(self, space_name):
         """특정 공간의 상세 정보 (Override 적용)"""
         try:
-            spaces = self.get_merged_spaces_data()
-
-            target_space = next(
-                (space for space in spaces
-                 if space_name.lower() in space.get('name', '').lower()),
-                None
-            )
+            target_space = get_data_snapshot().catalog.center_search.first(space_name, fields=('name',))
 
             if not target_space:
                 return {
@@ -143,12 +100,7 @@ class SpaceHandler(BaseHandler):
     def get_spaces_by_region(self, region):
         """지역별 청년공간 검색 (Override 적용)"""
         try:
-            spaces = self.get_merged_spaces_data()
-
-            filtered_spaces = [
-                space for space in spaces
-                if space.get('region', '').strip() == region
-            ]
+            filtered_spaces = list(get_data_snapshot().catalog.get_centers_by_region(region))
 
             if not filtered_spaces:
                 return {
@@ -181,14 +133,7 @@ class SpaceHandler(BaseHandler):
                     'message': '검색 키워드를 입력해주세요.'
                 }
 
-            spaces = self.get_merged_spaces_data()
-            keyword_lower = keyword.lower()
-
-            filtered_spaces = [
-                space for space in spaces
-                if any(keyword_lower in str(space.get(field, '')).lower()
-                       for field in ['name', 'description', 'region'])
-            ]
+            filtered_spaces = get_data_snapshot().catalog.center_search.search(keyword)
 
             if not filtered_spaces:
                 return {
@@ -255,6 +200,19 @@ class SpaceHandler(BaseHandler):
         except Exception as e:
             return self.handle_error(e, '청년공간 목록을 가져오는')
 
+    def get_condition_facet_counts(self, region='', capacity='', purpose=''):
+        """조건별 대여공간 검색 옵션별 결과 개수 (검색을 실행하지 않고 비트셋으로 계산)"""
+        try:
+            counts = get_data_snapshot().catalog.space_facets.counts(region, capacity, purpose)
+            return {
+                'success': True,
+                'selected': {'region': region, 'capacity': capacity, 'purpose': purpose},
+                'data': counts,
+                'message': f"선택한 조건에 맞는 대여공간은 {counts['total']}개입니다."
+            }
+        except Exception as e:
+            return self.handle_error(e, '조건별 검색 개수를 계산하는')
+
     def crawl_spaces_manually(self):
         """수동 청년공간 크롤링"""
         try:
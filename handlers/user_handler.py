@@ -1,6 +1,52 @@
+import base64
+import json
+import os
 from datetime import datetime
-from database.models import db, User, Chat, Message
+
+from sqlalchemy import func, select, tuple_
+
+from database.models import db, User, Chat, Message, DeletedChat
 from handlers.base_handler import BaseHandler
+from services.chat_writer import chat_writer
+
+# 히스토리 페이지 크기 (채팅 수), 채팅별 최근 메시지 수 - 요청 인자로 줄이거나 최대값까지 늘릴 수 있다
+# (cursor/limit/messages를 하나도 주지 않으면 예전처럼 모든 채팅과 메시지를 한 번에 돌려준다)
+HISTORY_PAGE_SIZE = int(os.environ.get('HISTORY_PAGE_SIZE', '20'))
+HISTORY_MAX_PAGE_SIZE = 100
+HISTORY_MESSAGES_PER_CHAT = int(os.environ.get('HISTORY_MESSAGES_PER_CHAT', '100'))
+HISTORY_MAX_MESSAGES_PER_CHAT = 500
+# 증분 동기화 한 번에 돌려줄 최대 메시지/삭제 수 (넘으면 has_more=True, 받은 cursor로 이어서 요청)
+HISTORY_SYNC_MAX_ITEMS = int(os.environ.get('HISTORY_SYNC_MAX_ITEMS', '500'))
+
+
+def _clamp(value, default, maximum):
+    if value is None or value < 1:
+        return default
+    return min(value, maximum)
+
+
+def _encode_cursor(*values):
+    raw = json.dumps(values).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def _decode_cursor(cursor, *types):
+    """_encode_cursor()로 만든 문자열 → 값 튜플 (types로 변환). 형식이 틀리면 ValueError"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        if len(values) != len(types):
+            raise ValueError('cursor length')
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('invalid cursor') from e
+
+
+def _sync_head():
+    """지금까지 저장된 마지막 메시지 id / 삭제 기록 id (PK 최댓값이라 바로 찾는다)"""
+    return (
+        db.session.execute(select(func.max(Message.id))).scalar() or 0,
+        db.session.execute(select(func.max(DeletedChat.id))).scalar() or 0
+    )
 
 
 class UserHandler(BaseHandler):
@@ -8,32 +54,168 @@ class UserHandler(BaseHandler):
         result = self.handle_error(error, context)
         return fallback if fallback is not None else result
 
-    def get_user_history(self, anonymous_id):
-        """사용자 채팅 히스토리 조회"""
+    def get_user_history(self, anonymous_id, cursor=None, limit=None, messages_per_chat=None, titles_only=False):
+        """사용자 채팅 히스토리 조회 (최신 채팅부터 페이지 단위)
+
+        cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+        limit: 한 페이지의 채팅 수, messages_per_chat: 채팅마다 돌려줄 최근 메시지 수
+        cursor/limit/messages_per_chat이 모두 없으면 페이지를 나누지 않고 전체 히스토리를 돌려준다 (기존 클라이언트 호환)
+        titles_only: 사이드바용 - 메시지 없이 채팅 id/제목만
+        첫 페이지에는 sync_cursor가 붙는다 - 이후 변경분은 sync_user_history(since=sync_cursor)로 받는다
+        """
         try:
-            user = User.query.filter_by(anonymous_id=anonymous_id).first()
-            if not user:
-                return {"success": True, "data": {}}
-
-            chats = Chat.query.filter_by(user_id=user.id).order_by(Chat.created_at.desc()).all()
-
-            history = {
-                chat.id: {
-                    'id': chat.id,
-                    'title': chat.title,
-                    'messages': [
-                        {'sender': msg.sender, 'text': msg.text}
-                        for msg in chat.messages
-                    ]
+            # write-behind 저장 중인 이 사용자의 턴을 먼저 저장해서 방금 보낸 메시지도 보이게 한다
+            chat_writer.flush_for_user(anonymous_id)
+
+            paginate = cursor is not None or limit is not None or messages_per_chat is not None
+            if paginate:
+                limit = _clamp(limit, HISTORY_PAGE_SIZE, HISTORY_MAX_PAGE_SIZE)
+                messages_per_chat = _clamp(messages_per_chat, HISTORY_MESSAGES_PER_CHAT, HISTORY_MAX_MESSAGES_PER_CHAT)
+            try:
+                after = _decode_cursor(cursor, datetime.fromisoformat, str) if cursor else None
+            except ValueError:
+                return {"success": False, "data": {}, "message": "잘못된 cursor입니다."}
+
+            # 페이지를 읽기 전에 잡아야 그 사이에 저장된 메시지를 동기화에서 놓치지 않는다 (중복은 메시지 id로 거른다)
+            sync_cursor = None if after else _encode_cursor(*_sync_head())
+            empty = {"success": True, "data": {}, "order": [], "next_cursor": None, "has_more": False}
+            if sync_cursor:
+                empty['sync_cursor'] = sync_cursor
+            user_id = db.session.execute(
+                select(User.id).where(User.anonymous_id == anonymous_id)
+            ).scalar()
+            if user_id is None:
+                return empty
+
+            # (created_at, id) keyset - ix_chat_user_id_created_at 인덱스를 따라 다음 페이지만 읽는다
+            query = select(Chat.id, Chat.title, Chat.created_at).where(Chat.user_id == user_id)
+            if after:
+                query = query.where(tuple_(Chat.created_at, Chat.id) < tuple_(*after))
+            query = query.order_by(Chat.created_at.desc(), Chat.id.desc())
+            chats = db.session.execute(query.limit(limit + 1) if paginate else query).all()
+
+            has_more = paginate and len(chats) > limit
+            if paginate:
+                chats = chats[:limit]
+            if not chats:
+                return empty
+
+            if titles_only:
+                history = {chat.id: {'id': chat.id, 'title': chat.title} for chat in chats}
+            else:
+                messages = self._recent_messages([chat.id for chat in chats], messages_per_chat)
+                history = {
+                    chat.id: {
+                        'id': chat.id,
+                        'title': chat.title,
+                        **messages.get(chat.id, {'messages': [], 'message_count': 0})
+                    }
+                    for chat in chats
                 }
-                for chat in chats
-            }
 
-            return {"success": True, "data": history}
+            last = chats[-1]
+            result = {
+                "success": True,
+                "data": history,
+                # JSON 객체 키는 정렬되므로 최신순 순서는 따로 전달
+                "order": [chat.id for chat in chats],
+                "next_cursor": _encode_cursor(last.created_at.isoformat(), last.id) if has_more else None,
+                "has_more": has_more
+            }
+            if sync_cursor:
+                result['sync_cursor'] = sync_cursor
+            return result
 
         except Exception as e:
             return self._handle_api_error(e, fallback={"success": False, "data": {}})
 
+    @staticmethod
+    def _recent_messages(chat_ids, per_chat):
+        """페이지의 모든 채팅에서 최근 메시지 per_chat개씩(None이면 전부)을 쿼리 한 번으로 조회 (채팅별 N+1 lazy 로딩 대신)"""
+        ranked = select(
+            Message.id,
+            Message.chat_id,
+            Message.sender,
+            Message.text,
+            func.row_number().over(
+                partition_by=Message.chat_id, order_by=(Message.created_at.desc(), Message.id.desc())
+            ).label('rank'),
+            func.count().over(partition_by=Message.chat_id).label('total')
+        ).where(Message.chat_id.in_(chat_ids)).subquery()
+
+        query = select(ranked).order_by(ranked.c.chat_id, ranked.c.rank.desc())
+        if per_chat is not None:
+            query = query.where(ranked.c.rank <= per_chat)
+        rows = db.session.execute(query).all()
+
+        messages = {}
+        for row in rows:
+            entry = messages.setdefault(row.chat_id, {'messages': [], 'message_count': row.total})
+            entry['messages'].append({'id': row.id, 'sender': row.sender, 'text': row.text})
+        return messages
+
+    def sync_user_history(self, anonymous_id, since=None):
+        """since 이후에 추가된 메시지와 삭제된 채팅만 조회 (히스토리 증분 동기화)
+
+        since: 히스토리 첫 페이지의 sync_cursor 또는 이전 동기화의 cursor (없으면 현재 위치만 돌려준다)
+        클라이언트는 deleted의 채팅을 먼저 지우고 chats의 메시지를 id 기준으로 덧붙인다
+        (삭제 후 같은 채팅 id로 새 메시지가 오면 둘 다 담긴다)
+        """
+        try:
+            chat_writer.flush_for_user(anonymous_id)
+
+            if not since:
+                return {"success": True, "chats": {}, "deleted": [], "cursor": _encode_cursor(*_sync_head()),
+                        "has_more": False}
+            try:
+                message_after, deleted_after = _decode_cursor(since, int, int)
+            except ValueError:
+                return {"success": False, "chats": {}, "deleted": [], "message": "잘못된 cursor입니다."}
+
+            user_id = db.session.execute(
+                select(User.id).where(User.anonymous_id == anonymous_id)
+            ).scalar()
+
+            rows, deletions = [], []
+            if user_id is not None:
+                # 새 메시지: 사용자의 채팅(ix_chat_user_id_created_at) × message PK 범위
+                rows = db.session.execute(
+                    select(Message.id, Message.chat_id, Message.sender, Message.text, Chat.title)
+                    .join(Chat, Message.chat_id == Chat.id)
+                    .where(Chat.user_id == user_id, Message.id > message_after)
+                    .order_by(Message.id)
+                    .limit(HISTORY_SYNC_MAX_ITEMS + 1)
+                ).all()
+                deletions = db.session.execute(
+                    select(DeletedChat.id, DeletedChat.chat_id)
+                    .where(DeletedChat.user_id == user_id, DeletedChat.id > deleted_after)
+                    .order_by(DeletedChat.id)
+                    .limit(HISTORY_SYNC_MAX_ITEMS + 1)
+                ).all()
+
+            has_more = len(rows) > HISTORY_SYNC_MAX_ITEMS or len(deletions) > HISTORY_SYNC_MAX_ITEMS
+            rows = rows[:HISTORY_SYNC_MAX_ITEMS]
+            deletions = deletions[:HISTORY_SYNC_MAX_ITEMS]
+
+            chats = {}
+            for row in rows:
+                chat = chats.setdefault(row.chat_id, {'id': row.chat_id, 'title': row.title, 'messages': []})
+                chat['messages'].append({'id': row.id, 'sender': row.sender, 'text': row.text})
+
+            return {
+                "success": True,
+                "chats": chats,
+                "deleted": [deletion.chat_id for deletion in deletions],
+                "cursor": _encode_cursor(
+                    rows[-1].id if rows else message_after,
+                    deletions[-1].id if deletions else deleted_after
+                ),
+                "has_more": has_more
+            }
+
+        except Exception as e:
+            return self._handle_api_error(e, fallback={"success": False, "chats": {}, "deleted": []})
+
     def get_user_info(self, anonymous_id):
         """사용자 정보 조회"""
         try:
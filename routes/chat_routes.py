@@ -1,28 +1,68 @@
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from handlers.chat_handler import chat_handler
 
 chat_bp = Blueprint('chat', __name__, url_prefix='/api')
 
 
-@chat_bp.route('/chat', methods=['POST', 'OPTIONS'])
-def chat():
-    if request.method == 'OPTIONS':
-        return jsonify({'status': 'ok'}), 200
+def _chat_request_data():
+    """채팅 요청 본문 검증 - (데이터, None) 또는 (None, 에러 응답)
 
+    선택 필드 bypassCache=true: 맥락이 중요한 대화에서 LLM 답변 캐시를 건너뛴다
+    """
     data = request.get_json()
     if not data:
-        return jsonify({'success': False, 'error': '요청 데이터가 없습니다.'}), 400
+        return None, (jsonify({'success': False, 'error': '요청 데이터가 없습니다.'}), 400)
 
     missing = [f for f in ['message', 'anonymousId', 'chatId'] if not data.get(f)]
     if missing:
-        return jsonify({'success': False, 'error': f"필수 정보 누락: {', '.join(missing)}"}), 400
+        return None, (jsonify({'success': False, 'error': f"필수 정보 누락: {', '.join(missing)}"}), 400)
+
+    return data, None
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+@chat_bp.route('/chat', methods=['POST', 'OPTIONS'])
+def chat():
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+
+    data, error = _chat_request_data()
+    if error:
+        return error
 
     result, status_code = chat_handler.process_chat_message(
-        data['message'], data['anonymousId'], data['chatId']
+        data['message'], data['anonymousId'], data['chatId'], use_cache=not data.get('bypassCache')
     )
     return jsonify(result), status_code
 
 
+@chat_bp.route('/chat/stream', methods=['POST', 'OPTIONS'])
+def chat_stream():
+    """/api/chat과 같은 요청 본문, 응답은 Server-Sent Events (message | delta* → done, 또는 error)"""
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
+
+    data, error = _chat_request_data()
+    if error:
+        return error
+
+    events = chat_handler.stream_chat_message(
+        data['message'], data['anonymousId'], data['chatId'], use_cache=not data.get('bypassCache')
+    )
+    response = Response(
+        stream_with_context(_sse(event, payload) for event, payload in events),
+        mimetype='text/event-stream'
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    # Render 등 앞단 프록시가 응답을 모아서 보내지 않도록
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @chat_bp.route('/chat/<chat_id>', methods=['DELETE'])
 def delete_chat(chat_id):
     result, status_code = chat_handler.delete_chat_session(chat_id)
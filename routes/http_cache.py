@@ -0,0 +1,190 @@
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import request, make_response
+from services.data_snapshot import get_data_snapshot
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 - 없으면 gzip만 사용
+    brotli = None
+
+# 전체 데이터셋을 그대로 내려주는 GET 엔드포인트용 조건부 요청(ETag / If-None-Match) 처리.
+# ETag는 데이터 스냅샷의 내용 해시(digest)로 만든다. 워커마다 다른 스냅샷 버전 번호와 달리
+# 같은 파일 내용이면 모든 워커에서 같은 값이라, 어느 워커가 응답해도 304를 돌려줄 수 있다.
+
+CACHE_MAX_AGE = int(os.environ.get('HTTP_CACHE_MAX_AGE', '60'))
+CACHE_STALE_WHILE_REVALIDATE = int(os.environ.get('HTTP_CACHE_STALE_WHILE_REVALIDATE', '600'))
+
+CACHE_CONTROL = f'public, max-age={CACHE_MAX_AGE}, stale-while-revalidate={CACHE_STALE_WHILE_REVALIDATE}'
+
+# 미리 압축해두는 응답 본문 설정
+PAYLOAD_CACHE_SIZE = int(os.environ.get('PAYLOAD_CACHE_SIZE', '64'))
+MIN_COMPRESS_SIZE = 1024
+
+_ENCODERS = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+if brotli is not None:
+    _ENCODERS['br'] = lambda data: brotli.compress(data, quality=11)
+
+
+def negotiate_encoding():
+    """Accept-Encoding에서 사용할 압축 방식 선택 (br > gzip). 압축하지 않으면 None"""
+    for encoding in ('br', 'gzip'):
+        if encoding in _ENCODERS and request.accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+def _etag_for(encoding=None):
+    etag = f'{request.endpoint}-{get_data_snapshot().digest}'
+    # 압축 본문은 바이트가 다르므로 실제로 적용된 인코딩(Content-Encoding)별로 다른 강한 ETag를 쓴다
+    if encoding:
+        etag = f'{etag}-{encoding}'
+    return etag
+
+
+def snapshot_etag(view):
+    """스냅샷 기반 강한 ETag + Cache-Control을 붙이고, If-None-Match가 일치하면 본문 없이 304 반환
+
+    실패 응답(success=False, 4xx/5xx)은 캐시하지 않는다.
+    @precompressed 뷰는 작은 본문이면 압축하지 않으므로, 본문(캐시된 바이트라 저렴하다)을 먼저 얻어서
+    실제 Content-Encoding으로 ETag를 만든다.
+    """
+    is_precompressed = getattr(view, 'precompressed', False)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if is_precompressed:
+            response = make_response(view(*args, **kwargs))
+            if not _is_success(response):
+                return response
+            etag = _etag_for(response.headers.get('Content-Encoding'))
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+        else:
+            etag = _etag_for()
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if not _is_success(response):
+                    return response
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = CACHE_CONTROL
+        # CORS 응답 헤더가 Origin에 따라 달라지므로 CDN이 Origin별로 캐시하도록 한다
+        response.vary.add('Origin')
+        if is_precompressed:
+            response.vary.add('Accept-Encoding')
+        return response
+
+    return wrapper
+
+
+class PayloadCache:
+    """(엔드포인트, URL 인자) → 직렬화된 JSON 본문과 인코딩별 압축본. 스냅샷 digest가 바뀌면 비운다"""
+
+    def __init__(self, max_entries=PAYLOAD_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._digest = None
+        self.hits = 0
+        self.misses = 0
+
+    def _sync_digest(self, digest):
+        if digest != self._digest:
+            self._entries.clear()
+            self._digest = digest
+
+    def get(self, digest, key, encoding):
+        """저장된 (본문, 적용된 인코딩) 반환. 없으면 None
+
+        요청한 인코딩의 압축본이 아직 없으면 이때 한 번 압축해서 저장한다.
+        작은 본문(MIN_COMPRESS_SIZE 미만)은 압축하지 않고 원본을 돌려준다.
+        """
+        with self._lock:
+            self._sync_digest(digest)
+            encoded = self._entries.get(key)
+            if encoded is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            raw = encoded[None]
+            if encoding is None or len(raw) < MIN_COMPRESS_SIZE:
+                return raw, None
+            body = encoded.get(encoding)
+
+        if body is None:
+            body = _ENCODERS[encoding](raw)
+            with self._lock:
+                encoded[encoding] = body
+        return body, encoding
+
+    def put(self, digest, key, raw):
+        with self._lock:
+            self._sync_digest(digest)
+            self._entries[key] = {None: raw}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'encodings': ['identity'] + list(_ENCODERS)
+            }
+
+
+payload_cache = PayloadCache()
+
+
+def _payload_response(body, encoding):
+    response = make_response(body)
+    response.mimetype = 'application/json'
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    # 성공 응답만 캐시에 들어가므로 @snapshot_etag가 본문을 다시 파싱할 필요가 없다
+    response.from_payload_cache = True
+    return response
+
+
+def _is_success(response):
+    if getattr(response, 'from_payload_cache', False):
+        return True
+    body = response.get_json(silent=True)
+    return response.status_code == 200 and not (isinstance(body, dict) and body.get('success') is False)
+
+
+def precompressed(view):
+    """성공한 JSON 응답 본문을 스냅샷 버전별로 한 번만 직렬화/압축해서 재사용
+
+    작은 본문(MIN_COMPRESS_SIZE 미만)은 압축하지 않는다. @snapshot_etag보다 안쪽에 붙인다.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        digest = get_data_snapshot().digest
+        key = (request.endpoint, tuple(sorted(kwargs.items())))
+        encoding = negotiate_encoding()
+
+        cached = payload_cache.get(digest, key, encoding)
+        if cached is None:
+            response = make_response(view(*args, **kwargs))
+            if not _is_success(response):
+                return response
+            payload_cache.put(digest, key, response.get_data())
+            cached = payload_cache.get(digest, key, encoding)
+
+        return _payload_response(*cached)
+
+    wrapper.precompressed = True
+    return wrapper
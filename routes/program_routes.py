@@ -1,10 +1,13 @@
 from flask import Blueprint, request, jsonify
 from handlers.program_handler import program_handler
+from routes.http_cache import snapshot_etag, precompressed
 
 program_bp = Blueprint('program', __name__, url_prefix='/api/programs')
 
 
 @program_bp.route('', methods=['GET'])
+@snapshot_etag
+@precompressed
 def get_programs():
     return jsonify(program_handler.get_all_programs())
 
@@ -1,19 +1,18 @@
-import json
-import os
 from flask import Blueprint, request, jsonify
 from handlers.space_handler import space_handler
-from handlers.base_handler import BaseHandler
+from services.data_snapshot import get_data_snapshot, refresh_data_snapshot
+from routes.http_cache import snapshot_etag, precompressed
 
 space_bp = Blueprint('space', __name__, url_prefix='/api/spaces')
 
-_base = BaseHandler()
-
 
 def _error(msg, code=500):
     return jsonify({'success': False, 'error': msg}), code
 
 
 @space_bp.route('', methods=['GET'])
+@snapshot_etag
+@precompressed
 def get_spaces():
     return jsonify(space_handler.get_all_spaces())
 
@@ -34,6 +33,15 @@ def search_spaces():
     return jsonify(space_handler.search_spaces_by_keyword(keyword))
 
 
+@space_bp.route('/condition-facets', methods=['GET'])
+def get_condition_facets():
+    return jsonify(space_handler.get_condition_facet_counts(
+        request.args.get('region', '').strip(),
+        request.args.get('capacity', '').strip(),
+        request.args.get('purpose', '').strip()
+    ))
+
+
 @space_bp.route('/detail/<space_name>', methods=['GET'])
 def get_space_detail(space_name):
     return jsonify(space_handler.get_space_detail(space_name))
@@ -45,6 +53,8 @@ def crawl_spaces():
 
 
 @space_bp.route('/cache-data', methods=['GET'])
+@snapshot_etag
+@precompressed
 def get_cache_data():
     try:
         merged_data = space_handler.get_merged_spaces_data()
@@ -59,16 +69,11 @@ def get_cache_data():
 
 
 @space_bp.route('/keyword-data', methods=['GET'])
+@snapshot_etag
+@precompressed
 def get_keyword_data():
     try:
-        config_path = _base.get_config_path()
-        keyword_file = os.path.join(config_path, 'spaces_busan_keyword.json')
-
-        if not os.path.exists(keyword_file):
-            return _error("키워드 데이터 파일을 찾을 수 없습니다.", 404)
-
-        with open(keyword_file, 'r', encoding='utf-8') as f:
-            keyword_data = json.load(f).get('spaces_busan_keyword', [])
+        keyword_data = list(get_data_snapshot().keyword_data)
 
         return jsonify({
             'success': True,
@@ -81,16 +86,11 @@ def get_keyword_data():
 
 
 @space_bp.route('/busan-youth', methods=['GET'])
+@snapshot_etag
+@precompressed
 def get_busan_youth_spaces():
     try:
-        config_path = _base.get_config_path()
-        spaces_file = os.path.join(config_path, 'spaces_busan_youth.json')
-
-        if not os.path.exists(spaces_file):
-            return _error("spaces_busan_youth.json 파일을 찾을 수 없습니다.", 404)
-
-        with open(spaces_file, 'r', encoding='utf-8') as f:
-            spaces_data = json.load(f).get('spaces_busan_youth', [])
+        spaces_data = list(get_data_snapshot().rental_spaces)
 
         if not spaces_data:
             return _error("청년공간 데이터가 없습니다.", 404)
@@ -106,18 +106,11 @@ def get_busan_youth_spaces():
 
 
 @space_bp.route('/rental-spaces/<center_name>', methods=['GET'])
+@snapshot_etag
+@precompressed
 def get_rental_spaces(center_name):
     try:
-        config_path = _base.get_config_path()
-        spaces_file = os.path.join(config_path, 'spaces_busan_youth.json')
-
-        if not os.path.exists(spaces_file):
-            return _error("대여공간 데이터 파일을 찾을 수 없습니다.", 404)
-
-        with open(spaces_file, 'r', encoding='utf-8') as f:
-            all_spaces = json.load(f).get('spaces_busan_youth', [])
-
-        center_spaces = [s for s in all_spaces if s.get('parent_facility') == center_name]
+        center_spaces = list(get_data_snapshot().catalog.get_rental_spaces_by_facility(center_name))
 
         return jsonify({
             'success': True,
@@ -154,6 +147,7 @@ def get_overrides_status():
 @space_bp.route('/overrides/reload', methods=['POST'])
 def reload_overrides():
     try:
+        refresh_data_snapshot()
         override_spaces = space_handler.load_overrides_data()
         merged_spaces = space_handler.get_merged_spaces_data()
         return jsonify({
@@ -169,16 +163,15 @@ def reload_overrides():
 @space_bp.route('/overrides/test/<region>', methods=['GET'])
 def test_region_overrides(region):
     try:
-        from services.youth_space_crawler import get_cache_data_only
-        cache_spaces = get_cache_data_only()
-        cache_region = [s for s in cache_spaces if s.get('region') == region]
-        merged_region = [s for s in space_handler.get_merged_spaces_data() if s.get('region') == region]
+        catalog = get_data_snapshot().catalog
+        cache_region = catalog.cache_centers_by_region.get(region, ())
+        merged_region = catalog.get_centers_by_region(region)
 
         changes = []
         for merged in merged_region:
             name = merged.get('name', '')
-            cached = next((s for s in cache_region if s.get('name') == name), None)
-            if cached:
+            cached = catalog.cache_center_by_name.get(name)
+            if cached and cached.get('region') == region:
                 changed = [
                     {'field': f, 'old': cached.get(f, ''), 'new': merged.get(f, '')}
                     for f in ['contact', 'hours', 'address', 'homepage', 'sns']
@@ -204,13 +197,10 @@ def test_region_overrides(region):
 @space_bp.route('/overrides/compare/<space_name>', methods=['GET'])
 def compare_space(space_name):
     try:
-        from services.youth_space_crawler import get_cache_data_only
-        cache_spaces = get_cache_data_only()
-        cache_space = next((s for s in cache_spaces if space_name.lower() in s.get('name', '').lower()), None)
-        override_spaces = space_handler.load_overrides_data()
-        override_space = next((s for s in override_spaces if space_name.lower() in s.get('name', '').lower()), None)
-        merged_spaces = space_handler.get_merged_spaces_data()
-        merged_space = next((s for s in merged_spaces if space_name.lower() in s.get('name', '').lower()), None)
+        catalog = get_data_snapshot().catalog
+        cache_space = catalog.cache_center_search.first(space_name)
+        override_space = catalog.override_center_search.first(space_name)
+        merged_space = catalog.center_search.first(space_name, fields=('name',))
 
         return jsonify({
             'success': True,
@@ -234,8 +224,7 @@ def compare_space(space_name):
 def get_spaces_by_region_debug(region):
     try:
         result = space_handler.get_spaces_by_region(region)
-        override_spaces = space_handler.load_overrides_data()
-        region_overrides = [s for s in override_spaces if s.get('region') == region]
+        region_overrides = get_data_snapshot().catalog.override_centers_by_region.get(region, ())
         if result.get('success'):
             result['debug'] = {
                 'override_count_in_region': len(region_overrides),
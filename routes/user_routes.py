@@ -6,7 +6,18 @@ user_bp = Blueprint('user', __name__, url_prefix='/api')
 
 @user_bp.route('/history/<anonymous_id>', methods=['GET'])
 def get_history(anonymous_id):
-    return jsonify(user_handler.get_user_history(anonymous_id))
+    return jsonify(user_handler.get_user_history(
+        anonymous_id,
+        cursor=request.args.get('cursor'),
+        limit=request.args.get('limit', type=int),
+        messages_per_chat=request.args.get('messages', type=int),
+        titles_only=request.args.get('titlesOnly', '').lower() in ('1', 'true')
+    ))
+
+
+@user_bp.route('/history/<anonymous_id>/sync', methods=['GET'])
+def sync_history(anonymous_id):
+    return jsonify(user_handler.sync_user_history(anonymous_id, request.args.get('since')))
 
 
 @user_bp.route('/user/<anonymous_id>', methods=['GET'])
@@ -0,0 +1,70 @@
+from collections import deque
+
+# 여러 패턴(공간명, 센터명, 라우팅 키워드)을 한 번에 찾기 위한 Aho-Corasick 오토마톤.
+# 사용자 메시지를 한 번만 훑어서 메시지 안에 포함된 모든 패턴을 찾는다.
+
+
+class AhoCorasick:
+    """패턴 → 값 목록을 받아 텍스트 안에 등장하는 패턴들의 값을 찾아주는 오토마톤"""
+
+    def __init__(self, patterns):
+        """patterns: (패턴 문자열, 값) 쌍의 iterable. 같은 패턴에 여러 값을 매달 수 있다"""
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._always = []
+
+        for pattern, value in patterns:
+            if not pattern:
+                # 빈 문자열은 어떤 텍스트에도 포함된다 ("" in text == True)
+                self._always.append(value)
+                continue
+            self._add(pattern, value)
+
+        self._build()
+
+    def _add(self, pattern, value):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(value)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _states(self, text):
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            yield state
+
+    def find_all(self, text):
+        """text 안에 포함된 모든 패턴의 값 (중복 제거, 처음 등장한 순서)"""
+        found = dict.fromkeys(self._always)
+        for state in self._states(text):
+            for value in self._output[state]:
+                found.setdefault(value)
+        return list(found)
+
+    def contains_any(self, text):
+        if self._always:
+            return True
+        return any(self._output[state] for state in self._states(text))
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import closing
+
+from services.youth_space_crawler import get_instance_path
+
+# LLM 답변 캐시.
+# 같은 질문(정규화 후) + 같은 대화 맥락 + 같은 데이터 스냅샷 + 같은 시스템 프롬프트/모델이면 같은 답변을 재사용한다.
+# 메모리 LRU + TTL, 선택적으로 instance/llm_answer_cache.db(SQLite)에 저장해서 재시작/다른 워커와 공유한다.
+
+ANSWER_CACHE_ENABLED = os.environ.get('LLM_ANSWER_CACHE_ENABLED', '1') == '1'
+ANSWER_CACHE_SIZE = int(os.environ.get('LLM_ANSWER_CACHE_SIZE', '1000'))
+ANSWER_CACHE_TTL = int(os.environ.get('LLM_ANSWER_CACHE_TTL', str(24 * 60 * 60)))
+ANSWER_CACHE_PERSIST = os.environ.get('LLM_ANSWER_CACHE_PERSIST', '0') == '1'
+
+_IGNORED_CHARS = re.compile(r'[\s?!.,~…·]+')
+
+
+def normalize_question(text):
+    """띄어쓰기/문장부호/대소문자/전각 문자 차이를 무시한 질문 키 ("스터디 카페 어디?" == "스터디카페어디")"""
+    return _IGNORED_CHARS.sub('', unicodedata.normalize('NFKC', text)).lower()
+
+
+def answer_cache_key(model, messages, data_digest):
+    """LLM 요청 메시지 목록에서 캐시 키 생성 - 마지막 메시지(현재 질문)만 정규화하고 나머지는 그대로 지문에 넣는다"""
+    *context, question = messages
+    hasher = hashlib.sha256()
+    hasher.update(model.encode('utf-8'))
+    hasher.update(data_digest.encode('utf-8'))
+    hasher.update(json.dumps(context, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    hasher.update(normalize_question(question['content']).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+class AnswerCache:
+    """LRU + TTL 메모리 캐시, persist=True면 SQLite에도 기록하고 메모리 미스 시 조회"""
+
+    def __init__(self, max_entries=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL, persist=ANSWER_CACHE_PERSIST):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.persist = persist
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_path = None
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        if self.persist:
+            self._init_db()
+
+    def _init_db(self):
+        """캐시 DB 파일과 테이블을 한 번만 만든다"""
+        self._db_path = os.path.join(get_instance_path(), 'llm_answer_cache.db')
+        try:
+            with self._connect() as conn, conn:
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS answer_cache '
+                    '(key TEXT PRIMARY KEY, answer TEXT NOT NULL, expires_at REAL NOT NULL)'
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ 답변 캐시 DB 초기화 실패: {e}")
+
+    def _connect(self):
+        """with 블록이 끝나면 닫히는 연결 (with conn:은 commit/rollback만 하고 닫지 않는다)"""
+        return closing(sqlite3.connect(self._db_path, timeout=5))
+
+    def _remember(self, key, answer, expires_at):
+        with self._lock:
+            self._entries[key] = (answer, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry:
+                del self._entries[key]
+
+        if self.persist:
+            try:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        'SELECT answer, expires_at FROM answer_cache WHERE key = ? AND expires_at > ?', (key, now)
+                    ).fetchone()
+                if row:
+                    self._remember(key, row[0], row[1])
+                    with self._lock:
+                        self.persistent_hits += 1
+                    return row[0]
+            except sqlite3.Error as e:
+                print(f"⚠️ 답변 캐시 DB 조회 실패: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, answer):
+        expires_at = time.time() + self.ttl
+        self._remember(key, answer, expires_at)
+
+        if self.persist:
+            try:
+                with self._connect() as conn, conn:
+                    conn.execute('INSERT OR REPLACE INTO answer_cache VALUES (?, ?, ?)', (key, answer, expires_at))
+                    conn.execute('DELETE FROM answer_cache WHERE expires_at <= ?', (time.time(),))
+            except sqlite3.Error as e:
+                print(f"⚠️ 답변 캐시 DB 저장 실패: {e}")
+
+    def record_bypass(self):
+        with self._lock:
+            self.bypassed += 1
+
+    def stats(self):
+        with self._lock:
+            hits = self.hits + self.persistent_hits
+            total = hits + self.misses
+            return {
+                'enabled': ANSWER_CACHE_ENABLED,
+                'persist': self.persist,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'persistent_hits': self.persistent_hits,
+                'misses': self.misses,
+                'bypassed': self.bypassed,
+                'hit_rate': round(hits / total, 4) if total else 0.0
+            }
+
+
+answer_cache = AnswerCache()
@@ -0,0 +1,122 @@
+from services.center_merge import center_key
+from services.ngram_index import NgramIndex
+from services.aho_corasick import AhoCorasick
+from services.space_facets import SpaceFacets
+from services.keyword_normalizer import KeywordNormalizer
+from services.youth_program_crawler import match_program_region, normalize_region, parse_deadline_date
+
+# 데이터 스냅샷이 만들어질 때 함께 생성되는 조회용 인덱스 모음.
+# 요청 처리 시에는 리스트를 처음부터 훑지 않고 아래 인덱스(dict)로 바로 찾는다.
+
+BUSAN_REGIONS = ('중구', '동구', '서구', '영도구', '부산진구', '동래구', '연제구', '금정구',
+                 '북구', '사상구', '사하구', '강서구', '남구', '해운대구', '수영구', '기장군')
+
+
+def _group_by(items, key_fn):
+    groups = {}
+    for item in items:
+        groups.setdefault(key_fn(item), []).append(item)
+    return {key: tuple(values) for key, values in groups.items()}
+
+
+def _first_by(items, key_fn):
+    index = {}
+    for item in items:
+        index.setdefault(key_fn(item), item)
+    return index
+
+
+class Catalog:
+    """센터/대여공간/프로그램 인덱스
+
+    - center_by_name: 센터명 → 병합된 센터 (캐시 + Override)
+    - cache_center_by_name: 센터명 → 크롤링 캐시 원본
+    - centers_by_region / cache_centers_by_region / override_centers_by_region: 지역 → 센터 목록
+    - rental_spaces_by_facility: 센터명(parent_facility) → 대여공간 목록
+    - rental_space_by_key: (센터명, 공간명) → 대여공간
+    - rental_spaces_by_region: 지역(location) → 대여공간 목록
+    - programs_by_region: 부산 16개 구·군 → 해당 지역 프로그램 (마감일 포함, 복사본)
+    - *_search: 부분 문자열 검색용 n-gram 역색인 (services/ngram_index.py)
+    - rental_name_matcher: 메시지 안에 포함된 공간명/센터명 → 대여공간 위치 (Aho-Corasick)
+    - keyword_normalizer: 원문 키워드 → 표준 카테고리 ID (services/keyword_normalizer.py)
+    - rental_spaces_by_category: 표준 카테고리 ID → 대여공간 위치 목록 (포스팅 리스트)
+    - space_facets: 조건별 검색용 지역/인원/목적 비트셋 (services/space_facets.py)
+    """
+
+    def __init__(self, snapshot):
+        self.rental_spaces = snapshot.rental_spaces
+        self.center_by_name = _first_by(snapshot.centers, center_key)
+        self.cache_center_by_name = _first_by(snapshot.cache_centers, center_key)
+        self.centers_by_region = _group_by(snapshot.centers, lambda c: c.get('region', '').strip())
+        self.cache_centers_by_region = _group_by(snapshot.cache_centers, lambda c: c.get('region', ''))
+        self.override_centers_by_region = _group_by(snapshot.override_centers, lambda c: c.get('region', ''))
+
+        self.rental_spaces_by_facility = _group_by(snapshot.rental_spaces, lambda s: s.get('parent_facility'))
+        self.rental_space_by_key = _first_by(
+            snapshot.rental_spaces, lambda s: (s.get('parent_facility'), s.get('space_name'))
+        )
+        self.rental_spaces_by_region = _group_by(snapshot.rental_spaces, lambda s: s.get('location', '기타'))
+
+        self.center_search = NgramIndex(snapshot.centers, ('name', 'description', 'region'))
+        self.cache_center_search = NgramIndex(snapshot.cache_centers, ('name',))
+        self.override_center_search = NgramIndex(snapshot.override_centers, ('name',))
+        self.rental_space_search = NgramIndex(snapshot.rental_spaces, ('space_name', 'parent_facility'))
+        self.program_search = NgramIndex(snapshot.programs, ('title', 'location', 'region'))
+        self.rental_name_matcher = AhoCorasick(
+            (str(space.get(field, '')).lower(), position)
+            for position, space in enumerate(snapshot.rental_spaces)
+            for field in ('space_name', 'parent_facility')
+        )
+
+        self.keyword_normalizer = KeywordNormalizer(
+            keyword
+            for item in snapshot.rental_spaces + snapshot.keyword_data
+            for keyword in item.get('keywords', [])
+        )
+        self.rental_spaces_by_category = {}
+        for position, space in enumerate(snapshot.rental_spaces):
+            for category in self.keyword_normalizer.categories_of_all(space.get('keywords', [])):
+                self.rental_spaces_by_category.setdefault(category, []).append(position)
+
+        self.space_facets = SpaceFacets(snapshot.rental_spaces, BUSAN_REGIONS, self.rental_spaces_by_category)
+
+        self.programs_by_region = {
+            region: self._match_programs(snapshot.programs, region, snapshot.centers)
+            for region in BUSAN_REGIONS
+        }
+
+    @staticmethod
+    def _match_programs(programs, region, spaces_data):
+        region_normalized = normalize_region(region)
+        matched = []
+        for program in programs:
+            program = dict(program)
+            if match_program_region(program, region, region_normalized, spaces_data):
+                program['deadline_date'] = parse_deadline_date(program.get('application_period', ''))
+                matched.append(program)
+        return tuple(matched)
+
+    def get_center(self, name):
+        return self.center_by_name.get(name)
+
+    def get_centers_by_region(self, region):
+        return self.centers_by_region.get(region, ())
+
+    def get_rental_spaces_by_facility(self, facility_name):
+        return self.rental_spaces_by_facility.get(facility_name, ())
+
+    def get_rental_space(self, facility_name, space_name):
+        return self.rental_space_by_key.get((facility_name, space_name))
+
+    def get_rental_spaces_by_region(self, region):
+        return self.rental_spaces_by_region.get(region, ())
+
+    def get_rental_spaces_by_category(self, category):
+        return [self.rental_spaces[position] for position in self.rental_spaces_by_category.get(category, ())]
+
+    def find_rental_spaces_in_text(self, text):
+        """공간명/센터명이 text 안에 있거나, text가 공간명/센터명 안에 있는 대여공간 (원래 순서)"""
+        text = text.lower()
+        positions = set(self.rental_name_matcher.find_all(text))
+        positions.update(self.rental_space_search.positions(text))
+        return [self.rental_spaces[position] for position in sorted(positions)]
@@ -0,0 +1,51 @@
+# 크롤링 캐시 + Override 병합 규칙을 한 곳에서 관리한다.
+# 센터는 이름(name)으로 식별하며, Override에 removed:true가 있으면 병합 결과에서 제외한다.
+# 병합은 데이터 스냅샷이 만들어질 때 한 번만 수행되고, 각 Handler는 그 결과만 읽는다.
+
+
+def center_key(center):
+    """센터 식별 키 (병합/조회 공통)"""
+    return center.get('name', '')
+
+
+def merge_spaces_data(cache_spaces, override_spaces):
+    """캐시 데이터와 Override 데이터 병합 (override에 removed:true가 있으면 제외)"""
+    merged_spaces = []
+
+    override_dict = {center_key(space): space for space in override_spaces}
+
+    for cache_space in cache_spaces:
+        override_space = override_dict.get(center_key(cache_space))
+        if override_space is None:
+            merged_spaces.append(cache_space)
+        elif not override_space.get('removed'):
+            merged_spaces.append(override_space)
+
+    cache_keys = {center_key(space) for space in cache_spaces}
+    for override_space in override_spaces:
+        if center_key(override_space) not in cache_keys and not override_space.get('removed'):
+            merged_spaces.append(override_space)
+
+    return merged_spaces
+
+
+def build_center_details(centers, keyword_data):
+    """병합된 센터 정보에 키워드 데이터(introduction, keywords)를 합친 센터별 상세 정보"""
+    keyword_by_facility = {}
+    for keyword_item in keyword_data:
+        keyword_by_facility.setdefault(keyword_item.get('parent_facility'), keyword_item)
+
+    details = {}
+    for center in centers:
+        name = center_key(center)
+        if name in details:
+            continue
+
+        center_info = dict(center)
+        keyword_item = keyword_by_facility.get(name)
+        if keyword_item:
+            center_info['introduction'] = keyword_item.get('introduction', '')
+            center_info['keywords'] = keyword_item.get('keywords', [])
+        details[name] = center_info
+
+    return details
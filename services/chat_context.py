@@ -0,0 +1,92 @@
+import os
+
+# LLM 요청에 넣을 이전 대화 메시지(role 메시지 목록)를 토큰 예산 안에서 만든다.
+# - 최근 메시지 N개만 조회하고, 최신 메시지부터 예산이 허락하는 만큼 담는다.
+# - 결정적 라우트(지역/키워드 검색 등)가 만든 긴 봇 응답은 첫 줄만 남기고 생략한다.
+# - 창 밖으로 밀려난 오래된 메시지는 Chat.summary(누적 요약)로 접어서 넣는다.
+# 토큰 수는 tiktoken 없이 UTF-8 바이트 수로 어림한다 (한글 1자 ≈ 1토큰, 영문 3~4자 ≈ 1토큰).
+
+CONTEXT_TOKEN_BUDGET = int(os.environ.get('CHAT_CONTEXT_TOKEN_BUDGET', '1500'))
+CONTEXT_MAX_MESSAGES = int(os.environ.get('CHAT_CONTEXT_MAX_MESSAGES', '12'))
+MESSAGE_MAX_TOKENS = int(os.environ.get('CHAT_CONTEXT_MESSAGE_MAX_TOKENS', '300'))
+
+SUMMARY_MODEL = os.environ.get('CHAT_SUMMARY_MODEL', 'gpt-4o-mini')
+SUMMARY_MAX_TOKENS = int(os.environ.get('CHAT_SUMMARY_MAX_TOKENS', '300'))
+# 창 밖 메시지가 이만큼 쌓이면 요약을 갱신한다 (매 턴 요약 호출을 하지 않도록)
+# 갱신은 응답과 별도로 백그라운드에서 하고, 끝나기 전까지는 기존 요약을 쓴다
+SUMMARY_BATCH_MESSAGES = int(os.environ.get('CHAT_SUMMARY_BATCH_MESSAGES', '6'))
+
+ELIDED_LINE_MAX_CHARS = 80
+
+
+def estimate_tokens(text):
+    return (len(text.encode('utf-8')) + 2) // 3
+
+
+def truncate_to_tokens(text, max_tokens):
+    """어림 토큰 수가 max_tokens를 넘으면 잘라서 '…'를 붙인다"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    encoded = text.encode('utf-8')[:max_tokens * 3]
+    return encoded.decode('utf-8', errors='ignore').rstrip() + '…'
+
+
+def compact_message_text(message):
+    """맥락에 넣을 메시지 본문 - 결정적 라우트 응답은 첫 줄만, 나머지는 토큰 상한까지"""
+    if message.sender == 'bot' and message.route and message.route != 'llm':
+        first_line = message.text.strip().split('\n', 1)[0].strip()
+        return f"(검색 결과 생략) {first_line[:ELIDED_LINE_MAX_CHARS]}"
+
+    return truncate_to_tokens(message.text, MESSAGE_MAX_TOKENS)
+
+
+def format_message(message):
+    return f"{'사용자' if message.sender == 'user' else '챗봇'}: {compact_message_text(message)}"
+
+
+def build_history_messages(summary, recent_messages, budget=CONTEXT_TOKEN_BUDGET):
+    """누적 요약 + 최근 메시지(최신순으로 받은 목록)를 예산 안에서 시간순 role 메시지 목록으로 만든다
+
+    고정 시스템 프롬프트 뒤에 붙는 부분이다. 요약은 갱신될 때만 바뀌므로 별도 system 메시지로 앞에 둔다.
+    """
+    history = []
+    remaining = budget
+
+    if summary:
+        summary_text = f"[이전 대화 요약]\n{truncate_to_tokens(summary, SUMMARY_MAX_TOKENS)}"
+        history.append({"role": "system", "content": summary_text})
+        remaining -= estimate_tokens(summary_text)
+
+    recent = []
+    for message in recent_messages:
+        content = compact_message_text(message)
+        # role 메시지마다 붙는 형식 토큰 몫
+        cost = estimate_tokens(content) + 4
+        if cost > remaining:
+            break
+        recent.append({"role": "user" if message.sender == 'user' else "assistant", "content": content})
+        remaining -= cost
+
+    history.extend(reversed(recent))
+    return history
+
+
+def build_summary_messages(previous_summary, messages):
+    """누적 요약 갱신용 LLM 요청 메시지 (이전 요약 + 새로 창 밖으로 밀려난 메시지)"""
+    transcript = "\n".join(format_message(message) for message in messages)
+
+    return [
+        {
+            "role": "system",
+            "content": (
+                "너는 챗봇 대화 기록을 요약하는 도우미다. 이전 요약과 새 대화를 합쳐 "
+                "사용자의 관심 지역, 원하는 공간/프로그램 조건, 이미 안내받은 내용, 아직 해결되지 않은 질문 위주로 "
+                f"한국어 글머리 기호 목록으로 간결하게 요약하라. {SUMMARY_MAX_TOKENS}토큰을 넘기지 마라."
+            )
+        },
+        {
+            "role": "user",
+            "content": f"[이전 요약]\n{previous_summary or '없음'}\n\n[새 대화]\n{transcript}"
+        }
+    ]
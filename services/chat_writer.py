@@ -0,0 +1,213 @@
+import atexit
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import exists, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from database.models import db, User, Chat, Message
+from config.predefined_answers import PREDEFINED_ANSWERS
+
+# 채팅 턴 저장 (사용자/채팅 세션 생성, 제목, 사용자 메시지, 봇 메시지).
+# 기본은 요청 안에서 바로 한 트랜잭션으로 저장한다.
+# CHAT_WRITE_BEHIND=1이면 턴을 프로세스 내 대기열에 넣고 바로 응답하며, 백그라운드 writer가
+# BATCH_SIZE개가 쌓이거나 FLUSH_INTERVAL초가 지나면 여러 턴을 한 트랜잭션으로 묶어 저장한다.
+# - 종료 시(atexit, gunicorn worker_exit) 남은 턴을 모두 저장한다. 프로세스가 강제 종료되면 대기 중인 턴은 유실될 수 있다.
+# - 히스토리/대화 맥락/삭제처럼 DB를 읽는 쪽은 먼저 flush_for_*()를 호출해서 방금 쓴 턴을 읽을 수 있게 한다
+#   (같은 워커 안에서의 read-your-writes 보장).
+
+WRITE_BEHIND = os.environ.get('CHAT_WRITE_BEHIND', '0') == '1'
+BATCH_SIZE = int(os.environ.get('CHAT_WRITE_BATCH_SIZE', '50'))
+FLUSH_INTERVAL = float(os.environ.get('CHAT_WRITE_FLUSH_INTERVAL', '0.5'))
+
+
+def write_chat_turn(turn):
+    """턴 하나를 현재 세션에 기록 (commit은 호출한 쪽에서)"""
+    db.session.execute(
+        sqlite_insert(User).values(anonymous_id=turn['anonymous_id'])
+        .on_conflict_do_nothing(index_elements=['anonymous_id'])
+    )
+    db.session.execute(
+        sqlite_insert(Chat).values(
+            id=turn['chat_id'],
+            user_id=select(User.id).where(User.anonymous_id == turn['anonymous_id']).scalar_subquery(),
+            title=turn['user_text'],
+            created_at=turn['received_at']
+        ).on_conflict_do_nothing(index_elements=['id'])
+    )
+
+    # 메시지 목록을 불러오지 않고, 아직 메시지가 없는 채팅이면 제목을 첫 질문으로 바꾼다
+    if turn['user_text'] not in PREDEFINED_ANSWERS:
+        db.session.execute(
+            update(Chat)
+            .where(Chat.id == turn['chat_id'], ~exists().where(Message.chat_id == turn['chat_id']))
+            .values(title=turn['user_text'])
+        )
+
+    db.session.add_all([
+        Message(chat_id=turn['chat_id'], sender='user', text=turn['user_text'], created_at=turn['received_at']),
+        Message(chat_id=turn['chat_id'], sender='bot', text=turn['bot_text'], route=turn['route'],
+                created_at=turn['replied_at'])
+    ])
+
+
+class ChatWriter:
+    """채팅 턴 저장기 - 즉시 저장 또는 write-behind 배치 저장"""
+
+    def __init__(self, write_behind=WRITE_BEHIND, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.write_behind = write_behind
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._app = None
+        self._pending = deque()
+        # 대기열에서 꺼내서 저장 중인 턴 (read-your-writes 확인용)
+        self._inflight = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self.batches = 0
+        self.turns_written = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+
+    def init_app(self, app):
+        self._app = app
+        if self.write_behind and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='chat-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+            print(f"📝 채팅 write-behind 저장 사용 (배치 {self.batch_size}개 / {self.flush_interval}초)")
+
+    def save_turn(self, user_text, anonymous_id, chat_id, bot_text, route, received_at):
+        turn = {
+            'user_text': user_text,
+            'anonymous_id': anonymous_id,
+            'chat_id': chat_id,
+            'bot_text': bot_text,
+            'route': route,
+            'received_at': received_at,
+            'replied_at': datetime.utcnow()
+        }
+
+        if not self.write_behind or self._closed:
+            write_chat_turn(turn)
+            db.session.commit()
+            return
+
+        with self._cond:
+            self._pending.append(turn)
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._pending) < self.batch_size and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                if self._closed:
+                    # 남은 턴은 close()가 저장한다
+                    return
+            self.flush()
+
+    def flush(self):
+        """대기 중인 턴을 모두 한 트랜잭션으로 저장
+
+        DB 잠금 등 일시적 오류면 대기열 앞에 되돌려 다음에 다시 시도하고,
+        그 밖의 오류면 턴을 하나씩 저장해서 문제가 되는 턴만 버린다 (나머지 턴이 막히지 않도록).
+        """
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._pending)
+                self._pending.clear()
+                self._inflight = batch
+            if not batch:
+                return
+
+            started = time.time()
+            try:
+                self._write_batch(batch, started)
+            finally:
+                with self._cond:
+                    self._inflight = []
+
+    def _write_batch(self, batch, started):
+        with self._app.app_context():
+            try:
+                for turn in batch:
+                    write_chat_turn(turn)
+                db.session.commit()
+            except OperationalError as e:
+                db.session.rollback()
+                with self._cond:
+                    self._pending.extendleft(reversed(batch))
+                self.failures += 1
+                print(f"⚠️ 채팅 배치 저장 실패 ({len(batch)}턴), 다시 시도합니다: {e}")
+                return
+            except Exception as e:
+                db.session.rollback()
+                self.failures += 1
+                print(f"⚠️ 채팅 배치 저장 실패 ({len(batch)}턴), 턴별로 다시 저장합니다: {e}")
+                batch = self._write_one_by_one(batch)
+
+        self.batches += 1
+        self.turns_written += len(batch)
+        self.last_flush_ms = round((time.time() - started) * 1000, 2)
+
+    def _write_one_by_one(self, batch):
+        written = []
+        for turn in batch:
+            try:
+                write_chat_turn(turn)
+                db.session.commit()
+                written.append(turn)
+            except Exception as e:
+                db.session.rollback()
+                print(f"⚠️ 채팅 턴 저장 실패로 버림 (chat_id={turn['chat_id']}): {e}")
+        return written
+
+    def _has_pending(self, key, value):
+        with self._cond:
+            return any(turn[key] == value for turn in (*self._pending, *self._inflight))
+
+    def flush_for_user(self, anonymous_id):
+        """이 사용자의 대기 중인 턴이 있으면 먼저 저장 (히스토리 조회 전)"""
+        if self.write_behind and self._has_pending('anonymous_id', anonymous_id):
+            self.flush()
+
+    def flush_for_chat(self, chat_id):
+        """이 채팅의 대기 중인 턴이 있으면 먼저 저장 (대화 맥락 조회/삭제 전)"""
+        if self.write_behind and self._has_pending('chat_id', chat_id):
+            self.flush()
+
+    def close(self):
+        """남은 턴을 모두 저장하고 writer 종료"""
+        if self._closed:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self.flush()
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            'write_behind': self.write_behind,
+            'pending_turns': pending,
+            'batch_size': self.batch_size,
+            'flush_interval_seconds': self.flush_interval,
+            'batches': self.batches,
+            'turns_written': self.turns_written,
+            'failures': self.failures,
+            'last_flush_ms': self.last_flush_ms
+        }
+
+
+chat_writer = ChatWriter()
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from services.youth_space_crawler import (
+    get_config_path,
+    get_cache_file_path as get_spaces_cache_file_path,
+    get_overrides_file_path
+)
+from services.youth_program_crawler import get_cache_file_path as get_programs_cache_file_path
+from services.center_merge import merge_spaces_data, build_center_details
+from services.catalog import Catalog
+
+# 요청마다 JSON 파일을 다시 읽지 않도록, 설정 파일들을 한 번 읽어 만든 스냅샷을 프로세스 전체가 공유한다.
+# 파일의 (mtime, size)가 바뀐 경우에만 내용을 다시 읽고, 내용 해시까지 바뀌었을 때만 새 버전을 만든다.
+# 스냅샷 안의 리스트/딕셔너리는 읽기 전용으로 취급한다 - 수정이 필요하면 반드시 복사해서 쓸 것.
+
+SNAPSHOT_CHECK_INTERVAL = float(os.environ.get('SNAPSHOT_CHECK_INTERVAL', '1.0'))
+
+
+def get_rental_spaces_file_path():
+    """대여공간 시드 파일 경로 반환"""
+    return os.path.join(get_config_path(), 'spaces_busan_youth.json')
+
+
+def get_keyword_file_path():
+    """센터 키워드 시드 파일 경로 반환"""
+    return os.path.join(get_config_path(), 'spaces_busan_keyword.json')
+
+
+# (스냅샷 속성명, 파일 경로 함수, JSON 최상위 키)
+_SOURCES = [
+    ('cache_centers', get_spaces_cache_file_path, 'data'),
+    ('override_centers', get_overrides_file_path, 'data'),
+    ('rental_spaces', get_rental_spaces_file_path, 'spaces_busan_youth'),
+    ('keyword_data', get_keyword_file_path, 'spaces_busan_keyword'),
+    ('programs', get_programs_cache_file_path, 'data'),
+]
+
+
+class DataSnapshot:
+    """특정 시점의 설정 데이터 묶음 (불변, 버전 포함)
+
+    - version: 프로세스 안에서 데이터가 바뀔 때마다 1씩 증가하는 번호
+    - digest: 파일 내용 기반 해시 (워커가 달라도 같은 데이터면 같은 값)
+    - centers: 캐시 + Override 병합 결과
+    - center_details: 센터명 → 병합 결과 + 키워드 데이터(introduction, keywords)
+    - catalog: 조회용 인덱스 (services/catalog.py)
+    """
+
+    __slots__ = ('version', 'digest', 'built_at', 'cache_centers', 'override_centers',
+                 'centers', 'center_details', 'rental_spaces', 'keyword_data', 'programs', 'catalog')
+
+    def __init__(self, version, digest, sources):
+        self.version = version
+        self.digest = digest
+        self.built_at = datetime.utcnow()
+        self.cache_centers = tuple(sources.get('cache_centers', ()))
+        self.override_centers = tuple(sources.get('override_centers', ()))
+        self.rental_spaces = tuple(sources.get('rental_spaces', ()))
+        self.keyword_data = tuple(sources.get('keyword_data', ()))
+        self.programs = tuple(sources.get('programs', ()))
+        self.centers = tuple(merge_spaces_data(self.cache_centers, self.override_centers))
+        self.center_details = build_center_details(self.centers, self.keyword_data)
+        self.catalog = Catalog(self)
+
+    def stats(self):
+        return {
+            'version': self.version,
+            'digest': self.digest,
+            'built_at': self.built_at.isoformat(),
+            'cache_centers': len(self.cache_centers),
+            'override_centers': len(self.override_centers),
+            'centers': len(self.centers),
+            'rental_spaces': len(self.rental_spaces),
+            'programs': len(self.programs)
+        }
+
+
+_lock = threading.Lock()
+_snapshot = None
+_signature = None
+_last_checked = 0.0
+
+
+def _file_signature(path):
+    try:
+        stat = os.stat(path)
+        return path, stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return path, None, None
+
+
+def _current_signature():
+    return tuple(_file_signature(path_fn()) for _, path_fn, _ in _SOURCES)
+
+
+def _read_sources():
+    """모든 원본 파일을 읽어 (데이터, 내용 해시) 반환. 파싱 실패 시 None"""
+    sources = {}
+    hasher = hashlib.sha256()
+
+    for name, path_fn, key in _SOURCES:
+        path = path_fn()
+        hasher.update(name.encode('utf-8'))
+        if not os.path.exists(path):
+            sources[name] = []
+            continue
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            sources[name] = json.loads(raw.decode('utf-8')).get(key, [])
+            hasher.update(raw)
+        except Exception as e:
+            # 크롤링이 파일을 쓰는 도중에 읽은 경우 등 - 이전 스냅샷을 유지하고 다음 요청에서 재시도
+            print(f"⚠️ 스냅샷 원본 파일 읽기 실패 ({os.path.basename(path)}): {e}")
+            return None, None
+
+    return sources, hasher.hexdigest()[:16]
+
+
+def _rebuild(signature):
+    global _snapshot, _signature
+
+    sources, digest = _read_sources()
+    if sources is None:
+        if _snapshot is None:
+            _snapshot = DataSnapshot(1, 'empty', {})
+        return _snapshot
+
+    if _snapshot is None or _snapshot.digest != digest:
+        version = _snapshot.version + 1 if _snapshot else 1
+        _snapshot = DataSnapshot(version, digest, sources)
+        print(f"📦 데이터 스냅샷 v{version} 생성 (digest={digest}, 센터 {len(_snapshot.centers)}개)")
+
+    _signature = signature
+    return _snapshot
+
+
+def get_data_snapshot():
+    """현재 데이터 스냅샷 반환 - 파일이 바뀌었을 때만 다시 읽는다"""
+    global _last_checked
+
+    snapshot = _snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - _last_checked < SNAPSHOT_CHECK_INTERVAL:
+        return snapshot
+
+    signature = _current_signature()
+    if snapshot is not None and signature == _signature:
+        _last_checked = now
+        return snapshot
+
+    with _lock:
+        if _snapshot is None or signature != _signature:
+            _rebuild(signature)
+        _last_checked = now
+        return _snapshot
+
+
+def refresh_data_snapshot():
+    """크롤링/Override 수정 직후 호출 - 체크 주기를 기다리지 않고 즉시 파일 변경을 반영한다"""
+    global _last_checked
+    with _lock:
+        _rebuild(_current_signature())
+        _last_checked = time.monotonic()
+        return _snapshot
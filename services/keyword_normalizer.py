@@ -0,0 +1,51 @@
+from config.space_keywords import KEYWORD_CATEGORY, KEYWORD_MAPPING, PURPOSE_MAPPING
+
+# 공간 키워드 원문("🏫교육/강연", "🎤 교육/강연", "👥모임/커뮤니티" ...)을 표준 카테고리 ID로 정규화한다.
+# 판정 규칙은 기존 검색과 같다: 카테고리 표기 중 하나가 키워드 원문에 포함되거나 그 반대이면 해당 카테고리.
+# 스냅샷을 만들 때 등장하는 모든 원문 키워드를 한 번씩만 판정해두고, 검색은 카테고리 집합 조회로 처리한다.
+
+
+def _build_category_variants():
+    variants = {category: list(values) for category, values in PURPOSE_MAPPING.items()}
+    for keyword, category in KEYWORD_CATEGORY.items():
+        for value in KEYWORD_MAPPING.get(keyword, []):
+            if value not in variants[category]:
+                variants[category].append(value)
+    return {category: tuple(value.lower() for value in values) for category, values in variants.items()}
+
+
+CATEGORY_VARIANTS = _build_category_variants()
+
+
+def resolve_category(label):
+    """검색 라벨(검색 키워드 또는 목적명) → 표준 카테고리 ID. 모르는 라벨이면 None"""
+    if label in PURPOSE_MAPPING:
+        return label
+    return KEYWORD_CATEGORY.get(label)
+
+
+def _classify(raw_keyword):
+    raw_lower = raw_keyword.lower()
+    return frozenset(
+        category for category, variants in CATEGORY_VARIANTS.items()
+        if any(variant in raw_lower or raw_lower in variant for variant in variants)
+    )
+
+
+class KeywordNormalizer:
+    """원문 키워드 → 표준 카테고리 ID 집합 테이블"""
+
+    def __init__(self, raw_keywords):
+        self.table = {raw_keyword: _classify(raw_keyword) for raw_keyword in set(raw_keywords)}
+
+    def categories_of(self, raw_keyword):
+        categories = self.table.get(raw_keyword)
+        if categories is None:
+            categories = _classify(raw_keyword)
+        return categories
+
+    def categories_of_all(self, raw_keywords):
+        categories = set()
+        for raw_keyword in raw_keywords:
+            categories |= self.categories_of(raw_keyword)
+        return categories
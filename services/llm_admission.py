@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# OpenAI 동시 호출 수 제한 (admission control).
+# 동시에 MAX_CONCURRENCY개까지만 호출하고, 나머지는 최대 QUEUE_SIZE개까지 QUEUE_TIMEOUT초 동안 기다린다.
+# 대기열이 가득 찼거나 기다리다 시간이 지나면 LLMBusyError - 호출한 쪽에서 "혼잡" 안내 응답으로 대신한다.
+# 대화 요약처럼 생략해도 되는 백그라운드 호출은 try_slot()으로 빈 슬롯이 있을 때만 실행하고,
+# 건너뛴 횟수는 사용자 요청 거절(rejected_*)과 따로 센다.
+# 요청마다 자기 스레드/그린렛에서 호출하므로 별도 실행기 없이 슬롯만 관리한다 (gevent 워커와 같이 동작).
+
+MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '8'))
+QUEUE_SIZE = int(os.environ.get('LLM_QUEUE_SIZE', '16'))
+QUEUE_TIMEOUT = float(os.environ.get('LLM_QUEUE_TIMEOUT', '10'))
+
+
+class LLMBusyError(Exception):
+    """LLM 호출 슬롯을 얻지 못함 (reason: 'queue_full' | 'timeout')"""
+
+    def __init__(self, reason):
+        super().__init__(f'LLM 호출 혼잡 ({reason})')
+        self.reason = reason
+
+
+class AdmissionGate:
+    """동시 실행 슬롯 + 짧은 대기열"""
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, queue_size=QUEUE_SIZE, queue_timeout=QUEUE_TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.skipped_background = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _acquire(self, timeout):
+        started = time.time()
+        with self._cond:
+            if self._active >= self.max_concurrency:
+                if self._waiting >= self.queue_size or timeout <= 0:
+                    self.rejected_queue_full += 1
+                    raise LLMBusyError('queue_full')
+
+                self._waiting += 1
+                try:
+                    deadline = started + timeout
+                    while self._active >= self.max_concurrency:
+                        remaining = deadline - time.time()
+                        if remaining <= 0:
+                            self.rejected_timeout += 1
+                            raise LLMBusyError('timeout')
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            self._active += 1
+            waited = time.time() - started
+            self.admitted += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+
+    def _release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, timeout=None):
+        """슬롯을 잡고 실행. timeout=0이면 기다리지 않고 바로 LLMBusyError"""
+        self._acquire(self.queue_timeout if timeout is None else timeout)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def try_slot(self):
+        """생략 가능한 백그라운드 호출용 - 빈 슬롯이 있고 기다리는 요청이 없을 때만 잡는다
+
+        잡았으면 True, 아니면 False를 넘긴다 (예외 없이, rejected_*가 아니라 skipped_background로 센다)
+        """
+        with self._cond:
+            acquired = self._active < self.max_concurrency and not self._waiting
+            if acquired:
+                self._active += 1
+            else:
+                self.skipped_background += 1
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self._release()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'queue_size': self.queue_size,
+                'queue_timeout_seconds': self.queue_timeout,
+                'in_flight': self._active,
+                'queued': self._waiting,
+                'admitted': self.admitted,
+                'rejected_queue_full': self.rejected_queue_full,
+                'rejected_timeout': self.rejected_timeout,
+                'skipped_background': self.skipped_background,
+                'avg_wait_seconds': round(self._total_wait / self.admitted, 3) if self.admitted else 0.0,
+                'max_wait_seconds': round(self._max_wait, 3)
+            }
+
+
+llm_gate = AdmissionGate()
@@ -0,0 +1,50 @@
+import threading
+
+# OpenAI 호출별 토큰 사용량/지연시간 누적 통계.
+# prompt_tokens 중 cached_tokens(프롬프트 캐시 적중분) 비율로 프롬프트 캐시 효과를 확인한다.
+
+
+class LLMUsageStats:
+    """모델별 호출 수, 입력/캐시/출력 토큰, 평균 지연시간"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models = {}
+
+    def record(self, model, usage, elapsed_seconds):
+        """usage: OpenAI 응답의 usage 객체 (없으면 호출 수/지연시간만 기록)"""
+        prompt_tokens = getattr(usage, 'prompt_tokens', 0) or 0
+        completion_tokens = getattr(usage, 'completion_tokens', 0) or 0
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+
+        with self._lock:
+            stats = self._models.setdefault(model, {
+                'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0,
+                'completion_tokens': 0, 'total_seconds': 0.0
+            })
+            stats['calls'] += 1
+            stats['prompt_tokens'] += prompt_tokens
+            stats['cached_tokens'] += cached_tokens
+            stats['completion_tokens'] += completion_tokens
+            stats['total_seconds'] += elapsed_seconds
+
+        print(f"🧮 {model} 토큰 사용: 입력 {prompt_tokens} (캐시 {cached_tokens}), 출력 {completion_tokens}, "
+              f"{elapsed_seconds:.2f}초")
+
+    def stats(self):
+        with self._lock:
+            return {
+                model: {
+                    'calls': s['calls'],
+                    'prompt_tokens': s['prompt_tokens'],
+                    'cached_tokens': s['cached_tokens'],
+                    'completion_tokens': s['completion_tokens'],
+                    'cached_ratio': round(s['cached_tokens'] / s['prompt_tokens'], 4) if s['prompt_tokens'] else 0.0,
+                    'avg_seconds': round(s['total_seconds'] / s['calls'], 3) if s['calls'] else 0.0
+                }
+                for model, s in self._models.items()
+            }
+
+
+llm_usage = LLMUsageStats()
@@ -0,0 +1,153 @@
+import os
+import random
+import threading
+import time
+
+import openai
+
+# OpenAI 호출의 시간 예산 / 재시도 / 서킷 브레이커.
+# - 요청 하나당 전체 시간 예산(LLM_DEADLINE) 안에서만 재시도하고, 각 시도의 timeout도 남은 예산으로 줄인다.
+# - 재시도는 일시적인 오류(시간 초과, 연결 오류, 429, 5xx)에만, 지수 백오프 + full jitter로 한다.
+# - 연속 실패가 임계값을 넘으면 COOLDOWN 동안 호출 없이 바로 실패시키고(open),
+#   그 뒤 한 번만 시험 호출해서(half_open) 성공하면 다시 닫는다(closed).
+# openai 클라이언트 자체 재시도는 끄고(max_retries=0) 여기서만 재시도한다.
+
+REQUEST_TIMEOUT = float(os.environ.get('LLM_REQUEST_TIMEOUT', '20'))
+DEADLINE = float(os.environ.get('LLM_DEADLINE', '30'))
+MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', '2'))
+RETRY_BASE_DELAY = float(os.environ.get('LLM_RETRY_BASE_DELAY', '0.5'))
+RETRY_MAX_DELAY = float(os.environ.get('LLM_RETRY_MAX_DELAY', '4'))
+# 남은 예산이 이보다 적으면 재시도하지 않는다
+MIN_ATTEMPT_SECONDS = 2.0
+
+BREAKER_THRESHOLD = int(os.environ.get('LLM_BREAKER_THRESHOLD', '5'))
+BREAKER_COOLDOWN = float(os.environ.get('LLM_BREAKER_COOLDOWN', '30'))
+
+RETRIABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 서킷 브레이커 (closed → open → half_open → closed)"""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.state = 'closed'
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self.short_circuited = 0
+        self.times_opened = 0
+        # 재시도 통계도 같은 잠금 안에서 센다 (여러 요청 스레드가 동시에 갱신)
+        self.retries = 0
+        self.deadline_exceeded = 0
+
+    def allow(self):
+        """호출해도 되면 그대로 반환, 아니면 CircuitOpenError"""
+        with self._lock:
+            if self.state == 'closed':
+                return
+
+            if self.state == 'open' and time.time() - self.opened_at >= self.cooldown:
+                self.state = 'half_open'
+
+            if self.state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+            self.short_circuited += 1
+            raise CircuitOpenError(f'LLM 서킷 브레이커 {self.state}')
+
+    def record_success(self):
+        with self._lock:
+            if self.state != 'closed':
+                print("✅ LLM 서킷 브레이커 닫힘 (시험 호출 성공)")
+            self.state = 'closed'
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == 'half_open' or (self.state == 'closed' and self.consecutive_failures >= self.threshold):
+                self.state = 'open'
+                self.opened_at = time.time()
+                self.times_opened += 1
+                print(f"🚨 LLM 서킷 브레이커 열림 (연속 실패 {self.consecutive_failures}회, {self.cooldown}초 차단)")
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_deadline_exceeded(self):
+        with self._lock:
+            self.deadline_exceeded += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'threshold': self.threshold,
+                'cooldown_seconds': self.cooldown,
+                'open_for_seconds': round(time.time() - self.opened_at, 1) if self.state != 'closed' else 0,
+                'times_opened': self.times_opened,
+                'short_circuited': self.short_circuited,
+                'retries': self.retries,
+                'deadline_exceeded': self.deadline_exceeded
+            }
+
+
+llm_breaker = CircuitBreaker()
+
+
+def _call_with_retries(create):
+    """create(timeout=...)를 시간 예산 안에서 재시도하며 호출"""
+    deadline = time.time() + DEADLINE
+    attempt = 0
+    while True:
+        remaining = deadline - time.time()
+        try:
+            return create(timeout=min(REQUEST_TIMEOUT, remaining))
+        except RETRIABLE_ERRORS as e:
+            attempt += 1
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            if attempt > MAX_RETRIES:
+                raise
+            if deadline - time.time() - delay < MIN_ATTEMPT_SECONDS:
+                llm_breaker.record_deadline_exceeded()
+                raise
+            llm_breaker.record_retry()
+            print(f"🔁 OpenAI 호출 재시도 {attempt}/{MAX_RETRIES} ({type(e).__name__}, {delay:.2f}초 후)")
+            time.sleep(delay)
+
+
+def guarded_call(create):
+    """서킷 브레이커 + 시간 예산 + 재시도를 적용한 OpenAI 호출
+
+    create: timeout 키워드 인자를 받아 client.chat.completions.create(...)를 호출하는 함수
+    일시적 오류만 브레이커 실패로 센다 (잘못된 요청 등은 업스트림 장애가 아님)
+    """
+    llm_breaker.allow()
+    try:
+        result = _call_with_retries(create)
+    except RETRIABLE_ERRORS:
+        llm_breaker.record_failure()
+        raise
+    except Exception:
+        # 400/401 등은 업스트림이 응답한 것이므로 장애로 보지 않는다
+        llm_breaker.record_success()
+        raise
+    llm_breaker.record_success()
+    return result
@@ -0,0 +1,65 @@
+# 한글 부분 문자열 검색용 문자 n-gram 역색인.
+# 기존 검색의 "keyword.lower() in field.lower()" 의미를 그대로 유지하되,
+# 검색어의 n-gram 포스팅 리스트 교집합으로 후보를 좁힌 뒤 후보만 실제 문자열로 검증한다.
+
+MAX_GRAM = 3
+
+
+def _grams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NgramIndex:
+    """레코드 목록의 지정 필드들에 대한 1~3-gram 역색인"""
+
+    def __init__(self, records, fields):
+        self.records = tuple(records)
+        self.fields = tuple(fields)
+        self._texts = []
+        self._postings = {}
+
+        for position, record in enumerate(self.records):
+            texts = {field: str(record.get(field, '')).lower() for field in self.fields}
+            self._texts.append(texts)
+            for text in texts.values():
+                for n in range(1, MAX_GRAM + 1):
+                    for gram in _grams(text, n):
+                        self._postings.setdefault(gram, set()).add(position)
+
+    def _candidates(self, query):
+        n = min(MAX_GRAM, len(query))
+        postings = []
+        for gram in _grams(query, n):
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return candidates
+
+    def positions(self, query, fields=None):
+        """query를 (대소문자 무시) 포함하는 레코드의 위치(records 인덱스)를 오름차순으로 반환"""
+        query = str(query).lower()
+        fields = tuple(fields) if fields else self.fields
+
+        if not query:
+            return list(range(len(self.records)))
+
+        return [
+            position for position in sorted(self._candidates(query))
+            if any(query in self._texts[position][field] for field in fields)
+        ]
+
+    def search(self, query, fields=None):
+        """query를 (대소문자 무시) 포함하는 레코드를 원래 순서대로 반환"""
+        return [self.records[position] for position in self.positions(query, fields)]
+
+    def first(self, query, fields=None):
+        results = self.search(query, fields)
+        return results[0] if results else None
@@ -0,0 +1,117 @@
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+# 결정적인 응답 문자열(지역별/키워드별 검색 결과, 센터 상세 등)을 데이터 스냅샷 버전별로 캐싱한다.
+# 키: (라우트, 정규화된 파라미터), 스냅샷 버전이 바뀌면 전체를 비운다.
+# 랜덤 추천처럼 매번 결과가 달라야 하는 응답에는 사용하지 않는다.
+# 버튼/지역/카테고리/센터처럼 값의 종류가 정해진 입력만 캐싱한다. 자유 입력 문장까지 넣으면 한 번 쓰고 말 항목이
+# LRU를 채워서 자주 쓰는 항목을 밀어내므로, key 함수가 None을 돌려주면 캐시 없이 바로 렌더링한다.
+
+RENDER_CACHE_SIZE = int(os.environ.get('RENDER_CACHE_SIZE', '512'))
+
+
+class RenderCache:
+    """스냅샷 버전에 묶인 LRU 캐시 (적중/미스 통계 포함)"""
+
+    def __init__(self, max_entries=RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.invalidations = 0
+
+    def _sync_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get_or_render(self, route, params, render):
+        """캐시에 있으면 바로 반환, 없으면 render()를 호출해서 저장 후 반환"""
+        from services.data_snapshot import get_data_snapshot
+        version = get_data_snapshot().version
+        key = (route, params)
+
+        with self._lock:
+            self._sync_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = render()
+
+        with self._lock:
+            if self._version == version:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+        return result
+
+    def record_uncached(self):
+        with self._lock:
+            self.uncached += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'data_version': self._version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'uncached': self.uncached,
+                'invalidations': self.invalidations
+            }
+
+
+render_cache = RenderCache()
+
+
+def _default_key(*args):
+    return args
+
+
+def region_cache_key(region):
+    """부산 16개 구·군만 캐싱 (그 밖의 값은 None)"""
+    from services.catalog import BUSAN_REGIONS
+    return (region,) if region in BUSAN_REGIONS else None
+
+
+def cached_render(route, key=None):
+    """렌더링 함수용 데코레이터. key(*args)로 캐시 파라미터를 만든다 (기본: 인자 그대로)
+
+    메서드에 사용할 때는 key가 self를 제외한 인자만 받는다.
+    key가 None을 반환하면 정해진 값이 아닌 입력이므로 캐싱하지 않는다.
+    """
+    key_fn = key or _default_key
+
+    def decorator(func):
+        is_method = func.__code__.co_varnames[:1] == ('self',)
+
+        @wraps(func)
+        def wrapper(*args):
+            params = key_fn(*(args[1:] if is_method else args))
+            if params is None:
+                render_cache.record_uncached()
+                return func(*args)
+            return render_cache.get_or_render(route, params, lambda: func(*args))
+
+        return wrapper
+
+    return decorator
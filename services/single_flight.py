@@ -0,0 +1,176 @@
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from services.answer_cache import ANSWER_CACHE_PERSIST
+from services.youth_space_crawler import get_instance_path
+
+try:
+    import fcntl
+except ImportError:  # Windows 로컬 개발 환경 - 워커 간 잠금 없이 프로세스 내 합치기만 사용
+    fcntl = None
+
+# 동일한 LLM 요청(최종 프롬프트 해시가 같은 요청)이 동시에 여러 개 들어오면 OpenAI 호출은 한 번만 하고
+# 나머지는 그 결과를 기다렸다가 같이 쓴다 (single-flight).
+# LLM_SINGLE_FLIGHT_CROSS_PROCESS=1이면 gunicorn 워커 사이에서도 프롬프트 해시별 파일 잠금으로 한 번에 하나만 호출한다.
+# 다른 워커의 결과는 답변 캐시 DB(LLM_ANSWER_CACHE_PERSIST=1)로만 공유되므로, 그 설정이 꺼져 있으면
+# 기다려도 결국 다시 호출하게 되어 워커 간 잠금은 쓰지 않는다.
+
+CROSS_PROCESS = os.environ.get('LLM_SINGLE_FLIGHT_CROSS_PROCESS', '0') == '1' and ANSWER_CACHE_PERSIST
+WAIT_TIMEOUT = float(os.environ.get('LLM_SINGLE_FLIGHT_TIMEOUT', '60'))
+# 블로킹 flock을 대신 기다리는 스레드 수 (워커당 동시에 잠금을 기다리는 서로 다른 프롬프트 수)
+LOCK_THREADS = 16
+
+_lock_pool = None
+_lock_pool_guard = threading.Lock()
+
+
+def _get_lock_pool():
+    """블로킹 flock을 실행할 실제 OS 스레드 풀 (gevent 워커면 허브를 막지 않도록 gevent 스레드 풀)"""
+    global _lock_pool
+    with _lock_pool_guard:
+        if _lock_pool is None:
+            try:
+                from gevent import monkey
+                patched = monkey.is_module_patched('threading')
+            except ImportError:
+                patched = False
+            if patched:
+                from gevent.threadpool import ThreadPoolExecutor
+                _lock_pool = ThreadPoolExecutor(max_workers=LOCK_THREADS)
+            else:
+                _lock_pool = concurrent.futures.ThreadPoolExecutor(max_workers=LOCK_THREADS,
+                                                                   thread_name_prefix='llm-lock')
+        return _lock_pool
+
+
+def _open_and_lock(path):
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    except OSError:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _release_late(future):
+    """시간 초과 뒤에 잡힌 잠금은 바로 놓는다 (fd를 닫으면 flock도 풀린다)"""
+    if not future.cancelled() and future.exception() is None:
+        os.close(future.result())
+
+
+def prompt_hash(model, messages):
+    payload = json.dumps([model, messages], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키별로 진행 중인 호출 하나를 공유하는 합치기 장치"""
+
+    def __init__(self, cross_process=CROSS_PROCESS, timeout=WAIT_TIMEOUT):
+        self.cross_process = cross_process and fcntl is not None
+        self.timeout = timeout
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def begin(self, key):
+        """(call, is_leader) 반환. 리더는 반드시 finish()를 호출해야 한다"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            self.leaders += 1
+            return call, True
+
+    def finish(self, key, call, result=None, error=None):
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    def wait(self, call):
+        """리더의 결과를 기다려서 반환 (리더가 실패했거나 시간 초과면 None)"""
+        if not call.done.wait(self.timeout) or call.error is not None:
+            return None
+        return call.result
+
+    def do(self, key, fn):
+        """같은 key로 진행 중인 호출이 있으면 그 결과를, 없으면 fn()을 실행해서 반환"""
+        call, is_leader = self.begin(key)
+        if not is_leader:
+            result = self.wait(call)
+            if result is not None:
+                return result
+            # 리더 실패/시간 초과 - 직접 호출한다
+            return fn()
+
+        try:
+            with self.process_lock(key):
+                result = fn()
+        except Exception as e:
+            self.finish(key, call, error=e)
+            raise
+        self.finish(key, call, result=result)
+        return result
+
+    @contextmanager
+    def process_lock(self, key):
+        """워커 간 잠금 (CROSS_PROCESS일 때만). 같은 프롬프트 해시끼리만 기다리고, 시간 안에 못 잡으면 잠금 없이 진행"""
+        if not self.cross_process:
+            yield
+            return
+
+        lock_dir = os.path.join(get_instance_path(), 'llm_locks')
+        os.makedirs(lock_dir, exist_ok=True)
+        path = os.path.join(lock_dir, f'{key}.lock')
+
+        future = _get_lock_pool().submit(_open_and_lock, path)
+        try:
+            fd = future.result(timeout=self.timeout)
+        except (concurrent.futures.TimeoutError, TimeoutError, OSError):
+            future.add_done_callback(_release_late)
+            fd = None
+
+        try:
+            yield
+        finally:
+            if fd is not None:
+                # 파일을 지운 뒤 놓는다. 이미 열고 기다리던 쪽과 새로 온 쪽이 동시에 진행할 수 있지만
+                # 둘 다 호출 전에 답변 캐시를 다시 보므로 결과는 같다
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                os.close(fd)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'cross_process': self.cross_process,
+                'in_flight': len(self._calls),
+                'leaders': self.leaders,
+                'coalesced': self.coalesced
+            }
+
+
+llm_single_flight = SingleFlight()
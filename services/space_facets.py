@@ -0,0 +1,141 @@
+from config.space_keywords import PURPOSE_MAPPING
+
+# 조건별 대여공간 검색(지역 × 인원 × 목적)용 비트셋.
+# 대여공간 목록의 i번째 공간이 조건을 만족하면 정수의 i번째 비트를 1로 둔다.
+# 스냅샷을 만들 때 옵션별 비트셋을 미리 계산해두고, 검색은 비트 AND 한 번으로 끝낸다.
+
+CAPACITY_OPTIONS = ('1-2명', '3-6명', '7명이상', '상관없음')
+
+
+def capacity_matches(space, selected_capacity):
+    """인원 조건 매칭 확인 (인원 정보가 없는 공간은 항상 매칭)"""
+    try:
+        capacity_min = space.get('capacity_min')
+        capacity_max = space.get('capacity_max')
+
+        if not capacity_min and not capacity_max:
+            return True
+
+        capacity_checks = {
+            '1-2명': lambda: capacity_min is None or capacity_min <= 2,
+            '3-6명': lambda: (capacity_min is None or capacity_min <= 6) and (
+                    capacity_max is None or capacity_max >= 3),
+            '7명이상': lambda: capacity_max is None or capacity_max >= 7,
+            '상관없음': lambda: True
+        }
+
+        return capacity_checks.get(selected_capacity, lambda: False)()
+
+    except Exception:
+        return True
+
+
+def purpose_matches(space, selected_purpose, purpose_mapping=PURPOSE_MAPPING):
+    """목적 조건 매칭 확인"""
+    try:
+        space_keywords = space.get('keywords', [])
+        if not space_keywords:
+            return False
+
+        search_keywords = purpose_mapping.get(selected_purpose, [selected_purpose])
+
+        for search_kw in search_keywords:
+            for space_kw in space_keywords:
+                if search_kw.lower() in space_kw.lower() or space_kw.lower() in search_kw.lower():
+                    return True
+
+        return False
+    except Exception:
+        return False
+
+
+def iter_positions(bits):
+    """비트셋에서 1인 비트의 위치를 오름차순으로 반환"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+def _bits_where(spaces, predicate):
+    bits = 0
+    for position, space in enumerate(spaces):
+        if predicate(space):
+            bits |= 1 << position
+    return bits
+
+
+class SpaceFacets:
+    """대여공간의 지역/인원/목적 옵션별 비트셋"""
+
+    def __init__(self, spaces, regions, spaces_by_category):
+        """spaces_by_category: 표준 카테고리 ID → 대여공간 위치 목록 (services/keyword_normalizer.py)"""
+        self.spaces = tuple(spaces)
+        self.regions = tuple(regions)
+        self.all_bits = (1 << len(self.spaces)) - 1
+
+        self.region_bits = {}
+        for position, space in enumerate(self.spaces):
+            location = space.get('location')
+            self.region_bits[location] = self.region_bits.get(location, 0) | (1 << position)
+
+        self.capacity_bits = {
+            option: _bits_where(self.spaces, lambda space, option=option: capacity_matches(space, option))
+            for option in CAPACITY_OPTIONS
+        }
+        # 목록에 없는 인원 옵션은 인원 정보가 없는 공간만 매칭된다 (capacity_matches와 동일)
+        self.unknown_capacity_bits = _bits_where(
+            self.spaces, lambda space: not space.get('capacity_min') and not space.get('capacity_max')
+        )
+
+        self.purpose_bits = {}
+        for purpose in PURPOSE_MAPPING:
+            bits = 0
+            for position in spaces_by_category.get(purpose, ()):
+                bits |= 1 << position
+            self.purpose_bits[purpose] = bits
+
+    def _region(self, region):
+        return self.region_bits.get(region, 0) if region else self.all_bits
+
+    def _capacity(self, capacity):
+        if not capacity:
+            return self.all_bits
+        return self.capacity_bits.get(capacity, self.unknown_capacity_bits)
+
+    def _purpose(self, purpose):
+        if not purpose:
+            return self.all_bits
+        bits = self.purpose_bits.get(purpose)
+        if bits is None:
+            bits = _bits_where(self.spaces, lambda space: purpose_matches(space, purpose))
+        return bits
+
+    def match_bits(self, region='', capacity='', purpose=''):
+        return self._region(region) & self._capacity(capacity) & self._purpose(purpose)
+
+    def filter(self, region='', capacity='', purpose=''):
+        """조건을 모두 만족하는 공간 목록 (원래 순서)"""
+        return [self.spaces[position] for position in iter_positions(self.match_bits(region, capacity, purpose))]
+
+    def counts(self, region='', capacity='', purpose=''):
+        """현재 선택 조건에서 각 옵션을 고르면 몇 개의 공간이 남는지 (다른 두 조건은 유지)"""
+        region_bits = self._region(region)
+        capacity_bits = self._capacity(capacity)
+        purpose_bits = self._purpose(purpose)
+
+        return {
+            'total': (region_bits & capacity_bits & purpose_bits).bit_count(),
+            'region': {
+                option: (self.region_bits.get(option, 0) & capacity_bits & purpose_bits).bit_count()
+                for option in self.regions
+            },
+            'capacity': {
+                option: (region_bits & self.capacity_bits[option] & purpose_bits).bit_count()
+                for option in CAPACITY_OPTIONS
+            },
+            'purpose': {
+                option: (region_bits & capacity_bits & self.purpose_bits[option]).bit_count()
+                for option in PURPOSE_MAPPING
+            }
+        }
@@ -7,6 +7,8 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from datetime import datetime, timedelta
 
+from services.render_cache import cached_render, region_cache_key
+
 # 데이터 출처: 부산청년플랫폼(young.busan.go.kr) 공개 페이지를 크롤링하여 수집.
 # 저작권/출처는 부산광역시 및 부산청년플랫폼에 있으며, 본 서비스는 정보 안내 목적으로만 사용한다.
 
@@ -277,17 +279,9 @@ def ensure_programs_cache_fresh():
 
 
 def get_youth_programs_data():
-    """청년 프로그램 데이터 가져오기 (요청 시점 크롤링 없음, 캐시 파일만 사용)"""
-    cache_file = get_cache_file_path()
-
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
-            return cached_data.get('data', [])
-        except Exception:
-            return []
-    return []
+    """청년 프로그램 데이터 가져오기 (요청 시점 크롤링 없음, 데이터 스냅샷에서 읽음)"""
+    from services.data_snapshot import get_data_snapshot
+    return list(get_data_snapshot().programs)
 
 
 def normalize_region(region):
@@ -354,24 +348,26 @@ def format_program_list(programs, region, max_count=3):
     return result
 
 
+@cached_render('program_region', key=region_cache_key)
 def search_programs_by_region(region):
-    """지역별 청년 프로그램 검색"""
-    programs = get_youth_programs_data()
-
-    try:
-        from services.youth_space_crawler import get_youth_spaces_data
-        spaces_data = get_youth_spaces_data()
-    except Exception:
-        spaces_data = []
+    """지역별 청년 프로그램 검색 (부산 16개 구·군은 스냅샷 인덱스 사용)"""
+    from services.data_snapshot import get_data_snapshot
+    snapshot = get_data_snapshot()
+    programs = snapshot.programs
 
     if not programs:
         return f"📌 {region} 청년공간 프로그램 안내(마감 임박순)\n\n현재 프로그램 정보를 가져올 수 없습니다.\n\n📌 전체 프로그램은 [청년 공간 프로그램](https://young.busan.go.kr/policySupport/act.nm?menuCd=261)에서 더 확인할 수 있어요."
 
+    if region in snapshot.catalog.programs_by_region:
+        return format_program_list(list(snapshot.catalog.programs_by_region[region]), region)
+
     region_normalized = normalize_region(region)
     filtered_programs = []
 
     for program in programs:
-        if match_program_region(program, region, region_normalized, spaces_data):
+        # 스냅샷 데이터는 공유되므로 region/deadline_date를 채우기 전에 복사한다
+        program = dict(program)
+        if match_program_region(program, region, region_normalized, snapshot.centers):
             deadline = parse_deadline_date(program.get('application_period', ''))
             program['deadline_date'] = deadline
             filtered_programs.append(program)
@@ -381,16 +377,12 @@ def search_programs_by_region(region):
 
 def search_programs_by_keyword(keyword):
     """키워드별 청년 프로그램 검색"""
-    programs = get_youth_programs_data()
-    if not programs:
+    from services.data_snapshot import get_data_snapshot
+    snapshot = get_data_snapshot()
+    if not snapshot.programs:
         return "현재 청년 프로그램 정보를 가져올 수 없습니다."
 
-    keyword_lower = keyword.lower()
-    filtered_programs = [
-        program for program in programs
-        if any(keyword_lower in str(program.get(field, '')).lower()
-               for field in ['title', 'location', 'region'])
-    ]
+    filtered_programs = snapshot.catalog.program_search.search(keyword)
 
     if not filtered_programs:
         return f"{keyword} 관련 모집중인 청년 프로그램을 찾을 수 없습니다.\n\n다른 키워드로 검색해보세요!"
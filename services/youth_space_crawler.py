@@ -7,6 +7,8 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote
 from datetime import datetime, timedelta
 
+from services.render_cache import cached_render, region_cache_key
+
 # 데이터 출처: 부산청년플랫폼(young.busan.go.kr) 공개 페이지를 크롤링하여 수집.
 # 저작권/출처는 부산광역시 및 부산청년플랫폼에 있으며, 본 서비스는 정보 안내 목적으로만 사용한다.
 
@@ -214,40 +216,9 @@ def save_to_config_file(spaces_data):
 
 
 def load_overrides_data():
-    """youth_spaces_overrides.json 데이터 로드"""
-    try:
-        overrides_file = get_overrides_file_path()
-
-        if os.path.exists(overrides_file):
-            with open(overrides_file, 'r', encoding='utf-8') as f:
-                overrides_data = json.load(f)
-            return overrides_data.get('data', [])
-        return []
-    except Exception:
-        return []
-
-
-def merge_spaces_data(cache_spaces, override_spaces):
-    """캐시 데이터와 Override 데이터 병합 (override에 removed:true가 있으면 제외)"""
-    merged_spaces = []
-
-    override_dict = {space.get('name', ''): space for space in override_spaces}
-
-    for cache_space in cache_spaces:
-        space_name = cache_space.get('name', '')
-        if space_name in override_dict:
-            override_space = override_dict[space_name]
-            if not override_space.get('removed'):
-                merged_spaces.append(override_space)
-        else:
-            merged_spaces.append(cache_space)
-
-    cache_names = {space.get('name', '') for space in cache_spaces}
-    for override_space in override_spaces:
-        if override_space.get('name', '') not in cache_names and not override_space.get('removed'):
-            merged_spaces.append(override_space)
-
-    return merged_spaces
+    """youth_spaces_overrides.json 데이터 (데이터 스냅샷에서 읽음)"""
+    from services.data_snapshot import get_data_snapshot
+    return list(get_data_snapshot().override_centers)
 
 
 def crawl_new_data():
@@ -293,38 +264,26 @@ def ensure_spaces_cache_fresh():
 
 
 def get_cache_data_only():
-    """캐시 파일 데이터만 반환 (요청 시점 크롤링 없음, config 파일 우선)"""
-    cache_file = get_cache_file_path()
-
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cached_data = json.load(f)
-            return cached_data.get('data', [])
-        except Exception:
-            return []
-    return []
+    """캐시 파일 데이터만 반환 (요청 시점 크롤링 없음, 데이터 스냅샷에서 읽음)"""
+    from services.data_snapshot import get_data_snapshot
+    return list(get_data_snapshot().cache_centers)
 
 
 def get_youth_spaces_data():
-    """청년공간 데이터 가져오기 (Override 적용)"""
-    cache_spaces = get_cache_data_only()
-    override_spaces = load_overrides_data()
-    merged_spaces = merge_spaces_data(cache_spaces, override_spaces)
-
-    return merged_spaces
+    """청년공간 데이터 가져오기 (Override 적용, 데이터 스냅샷에서 읽음)"""
+    from services.data_snapshot import get_data_snapshot
+    return list(get_data_snapshot().centers)
 
 
+@cached_render('space_region', key=region_cache_key)
 def search_spaces_by_region(region):
     """지역별 청년공간 검색 (Override 적용) - 구분선 추가"""
-    spaces = get_youth_spaces_data()
-    if not spaces:
+    from services.data_snapshot import get_data_snapshot
+    snapshot = get_data_snapshot()
+    if not snapshot.centers:
         return "현재 청년공간 정보를 가져올 수 없습니다."
 
-    filtered_spaces = [
-        space for space in spaces
-        if space.get('region', '').strip() == region
-    ]
+    filtered_spaces = snapshot.catalog.get_centers_by_region(region)
 
     if not filtered_spaces:
         return f"{region}에서 청년공간을 찾을 수 없습니다.\n\n다른 지역을 검색해보세요!"
@@ -342,16 +301,12 @@ def search_spaces_by_region(region):
 
 def search_spaces_by_keyword(keyword):
     """키워드별 청년공간 검색 (Override 적용) - 구분선 추가"""
-    spaces = get_youth_spaces_data()
-    if not spaces:
+    from services.data_snapshot import get_data_snapshot
+    snapshot = get_data_snapshot()
+    if not snapshot.centers:
         return "현재 청년공간 정보를 가져올 수 없습니다."
 
-    keyword_lower = keyword.lower()
-    filtered_spaces = [
-        space for space in spaces
-        if any(keyword_lower in str(space.get(field, '')).lower()
-               for field in ['name', 'description', 'region'])
-    ]
+    filtered_spaces = snapshot.catalog.center_search.search(keyword)
 
     if not filtered_spaces:
         return f"{keyword} 관련 청년공간을 찾을 수 없습니다.\n\n다른 키워드로 검색해보세요!"
@@ -0,0 +1,97 @@
+"""LLM 호출이 진행 중인 동안에도 DB 연결 풀이 다른 요청에 남아 있는지 확인
+
+실행: python -m unittest discover tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# 풀을 LLM 동시 호출 수만큼만 두어서, LLM 요청이 연결을 잡고 있으면 다른 요청이 바로 실패하게 한다
+DATA_DIR = tempfile.mkdtemp(prefix='busan-chatbot-test-')
+os.environ.update({
+    'RENDER_DISK_PATH': DATA_DIR,
+    'OPENAI_API_KEY': 'sk-test',
+    'SQLITE_POOL_SIZE': '2',
+    'SQLITE_POOL_MAX_OVERFLOW': '0',
+    'SQLITE_POOL_TIMEOUT': '1',
+    'CHAT_WRITE_BEHIND': '0',
+})
+
+import services.youth_program_crawler as youth_program_crawler
+import services.youth_space_crawler as youth_space_crawler
+
+# 부팅 시 크롤링하지 않고 저장소의 캐시 파일만 쓴다
+youth_space_crawler.ensure_spaces_cache_fresh = lambda: None
+youth_program_crawler.ensure_programs_cache_fresh = lambda: None
+
+from app import app
+from handlers.chat_handler import chat_handler
+
+LLM_REQUESTS = 2
+
+
+class SessionReleaseTest(unittest.TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+    def setUp(self):
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+        self.original_client = chat_handler.client
+        chat_handler.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=self._slow_create)))
+
+    def tearDown(self):
+        self.release.set()
+        chat_handler.client = self.original_client
+
+    def _slow_create(self, **kwargs):
+        self.started.release()
+        self.release.wait(10)
+        return SimpleNamespace(
+            usage=None,
+            choices=[SimpleNamespace(message=SimpleNamespace(content='느린 답변'))]
+        )
+
+    def _post_chat(self, message, chat_id, results):
+        response = app.test_client().post('/api/chat', json={
+            'message': message, 'anonymousId': f'user-{chat_id}', 'chatId': chat_id, 'bypassCache': True
+        })
+        results[chat_id] = (response.status_code, response.get_json())
+
+    def test_deterministic_route_while_llm_in_flight(self):
+        results = {}
+        threads = [
+            threading.Thread(target=self._post_chat, args=(f'질문 {i}', f'llm-chat-{i}', results))
+            for i in range(LLM_REQUESTS)
+        ]
+        for thread in threads:
+            thread.start()
+        for _ in range(LLM_REQUESTS):
+            self.assertTrue(self.started.acquire(timeout=10), 'LLM 호출이 시작되지 않았습니다')
+
+        response = app.test_client().post('/api/chat', json={
+            'message': '해운대구', 'anonymousId': 'user-region', 'chatId': 'region-chat'
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['route'], 'space_region')
+
+        self.release.set()
+        for thread in threads:
+            thread.join(10)
+        for i in range(LLM_REQUESTS):
+            status, body = results[f'llm-chat-{i}']
+            self.assertEqual(status, 200)
+            self.assertEqual(body['reply'], '느린 답변')
+
+
+if __name__ == '__main__':
+    unittest.main()